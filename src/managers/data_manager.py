@@ -17,6 +17,9 @@ import json
 import csv
 import yaml
 import os
+import re
+import fnmatch
+import mmap
 import pickle
 import sqlite3
 from datetime import datetime
@@ -24,6 +27,35 @@ from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 import pandas as pd
 
+from src.utils.io_utils import atomic_write, copy_file
+
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+try:
+    import zstandard as zstd
+except ImportError:  # backups fall back to plain copies
+    zstd = None
+
+# Numeric CSV cells: optional sign, digits with at most one decimal point
+_NUM_RE = re.compile(r'-?(?:[0-9]+\.?[0-9]*|\.[0-9]+)')
+
+
+def _coerce_csv_value(value: str) -> Any:
+    """Convert a raw CSV cell to None, bool, int, float or str."""
+    if value == '':
+        return None
+    lowered = value.lower()
+    if lowered == 'true':
+        return True
+    if lowered == 'false':
+        return False
+    if _NUM_RE.fullmatch(value):
+        return float(value) if '.' in value else int(value)
+    return value
+
 class DataManager:
     """
     Multi-format data manager for flexible storage and retrieval.
@@ -46,6 +78,37 @@ class DataManager:
         (self.base_path / "sales_history").mkdir(exist_ok=True)
         (self.base_path / "analytics").mkdir(exist_ok=True)
         (self.base_path / "backups").mkdir(exist_ok=True)
+        
+        # SQLite connections keyed by db_name, kept open until close() (or the
+        # end of a `with` block), and INSERT statements keyed by (table, columns)
+        self._sqlite_conns: Dict[str, sqlite3.Connection] = {}
+        self._stmt_cache: Dict[tuple, str] = {}
+    
+    def _get_sqlite_connection(self, db_name: str) -> sqlite3.Connection:
+        """Return the open connection for a database, opening it on first use."""
+        conn = self._sqlite_conns.get(db_name)
+        if conn is None:
+            conn = sqlite3.connect(self.base_path / f"{db_name}.db")
+            self._sqlite_conns[db_name] = conn
+        return conn
+    
+    def flush(self) -> None:
+        """Commit open SQLite connections so the .db files are complete."""
+        for conn in self._sqlite_conns.values():
+            conn.commit()
+    
+    def close(self) -> None:
+        """Close all open SQLite connections."""
+        for conn in self._sqlite_conns.values():
+            conn.commit()
+            conn.close()
+        self._sqlite_conns.clear()
+    
+    def __enter__(self) -> 'DataManager':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
     
     def save_json(self, data: Dict[str, Any], filename: str) -> bool:
         """Save data to JSON format with metadata."""
@@ -60,7 +123,7 @@ class DataManager:
                 }
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with atomic_write(filepath, 'w', encoding='utf-8') as f:
                 json.dump(data_with_metadata, f, indent=4, ensure_ascii=False)
             return True
         except Exception as e:
@@ -95,7 +158,7 @@ class DataManager:
                 fieldnames.update(item.keys())
             fieldnames = sorted(list(fieldnames))
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            with atomic_write(filepath, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
                 writer.writerows(data)
@@ -116,20 +179,7 @@ class DataManager:
                 reader = csv.DictReader(f)
                 for row in reader:
                     # Convert string values to appropriate types
-                    processed_row = {}
-                    for key, value in row.items():
-                        if value == '':
-                            processed_row[key] = None
-                        elif value.lower() in ('true', 'false'):
-                            processed_row[key] = value.lower() == 'true'
-                        elif value.replace('.', '').replace('-', '').isdigit():
-                            if '.' in value:
-                                processed_row[key] = float(value)
-                            else:
-                                processed_row[key] = int(value)
-                        else:
-                            processed_row[key] = value
-                    data.append(processed_row)
+                    data.append({key: _coerce_csv_value(value) for key, value in row.items()})
             
             return data
         except Exception as e:
@@ -142,7 +192,7 @@ class DataManager:
             filepath = self.base_path / filename
             if not data:
                 return False
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with atomic_write(filepath, 'w', encoding='utf-8') as f:
                 for item in data:
                     # Ensure description is present
                     line = delimiter.join(str(item.get(key, '')) for key in ['product_id', 'name', 'category', 'quantity', 'price', 'description'])
@@ -159,19 +209,29 @@ class DataManager:
             if not filepath.exists():
                 return []
             data = []
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        values = line.split(delimiter)
-                        # Always expect 6 fields: product_id, name, category, quantity, price, description
-                        if len(values) == 6:
-                            item = dict(zip(['product_id', 'name', 'category', 'quantity', 'price', 'description'], values))
-                        elif headers:
-                            item = dict(zip(headers, values))
-                        else:
-                            item = {f'field_{i}': value for i, value in enumerate(values)}
-                        data.append(item)
+            sep = delimiter.encode('utf-8')
+            with open(filepath, 'rb') as f:
+                # mmap refuses zero-length files
+                if os.fstat(f.fileno()).st_size == 0:
+                    return data
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    start, end = 0, len(mm)
+                    while start < end:
+                        nl = mm.find(b'\n', start)
+                        if nl == -1:
+                            nl = end
+                        line = mm[start:nl].strip()
+                        start = nl + 1
+                        if line:
+                            values = [value.decode('utf-8') for value in line.split(sep)]
+                            # Always expect 6 fields: product_id, name, category, quantity, price, description
+                            if len(values) == 6:
+                                item = dict(zip(['product_id', 'name', 'category', 'quantity', 'price', 'description'], values))
+                            elif headers:
+                                item = dict(zip(headers, values))
+                            else:
+                                item = {f'field_{i}': value for i, value in enumerate(values)}
+                            data.append(item)
             return data
         except Exception as e:
             print(f"Error loading TXT: {e}")
@@ -181,8 +241,8 @@ class DataManager:
         """Save data to YAML format."""
         try:
             filepath = self.base_path / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+            with atomic_write(filepath, 'w', encoding='utf-8') as f:
+                yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
             return True
         except Exception as e:
             print(f"Error saving YAML: {e}")
@@ -196,39 +256,43 @@ class DataManager:
                 return None
             
             with open(filepath, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YamlLoader)
         except Exception as e:
             print(f"Error loading YAML: {e}")
             return None
     
     def save_sqlite(self, data: Dict[str, List[Dict[str, Any]]], db_name: str) -> bool:
         """Save data to SQLite database."""
+        conn = None
         try:
-            db_path = self.base_path / f"{db_name}.db"
-            conn = sqlite3.connect(db_path)
+            conn = self._get_sqlite_connection(db_name)
             cursor = conn.cursor()
             
             for table_name, table_data in data.items():
                 if not table_data:
                     continue
                 
-                # Create table
-                columns = list(table_data[0].keys())
-                columns_sql = ', '.join([f"{col} TEXT" for col in columns])
-                cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_sql})")
+                # Create table and build the insert once per (table, columns)
+                columns = tuple(table_data[0].keys())
+                insert_sql = self._stmt_cache.get((table_name, columns))
+                if insert_sql is None:
+                    columns_sql = ', '.join([f"{col} TEXT" for col in columns])
+                    cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_sql})")
+                    placeholders = ', '.join(['?' for _ in columns])
+                    insert_sql = f"INSERT OR REPLACE INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+                    self._stmt_cache[(table_name, columns)] = insert_sql
                 
                 # Insert data
-                placeholders = ', '.join(['?' for _ in columns])
-                insert_sql = f"INSERT OR REPLACE INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
-                
-                for row in table_data:
-                    values = [str(row.get(col, '')) for col in columns]
-                    cursor.execute(insert_sql, values)
+                cursor.executemany(
+                    insert_sql,
+                    ([str(row.get(col, '')) for col in columns] for row in table_data)
+                )
             
             conn.commit()
-            conn.close()
             return True
         except Exception as e:
+            if conn is not None:
+                conn.rollback()
             print(f"Error saving SQLite: {e}")
             return False
     
@@ -236,10 +300,10 @@ class DataManager:
         """Load data from SQLite database."""
         try:
             db_path = self.base_path / f"{db_name}.db"
-            if not db_path.exists():
+            if db_name not in self._sqlite_conns and not db_path.exists():
                 return {}
             
-            conn = sqlite3.connect(db_path)
+            conn = self._get_sqlite_connection(db_name)
             cursor = conn.cursor()
             
             # Get all tables
@@ -250,16 +314,8 @@ class DataManager:
             for table in tables:
                 cursor.execute(f"SELECT * FROM {table}")
                 columns = [description[0] for description in cursor.description]
-                rows = cursor.fetchall()
-                
-                table_data = []
-                for row in rows:
-                    item = dict(zip(columns, row))
-                    table_data.append(item)
-                
-                data[table] = table_data
+                data[table] = [dict(zip(columns, row)) for row in cursor.fetchall()]
             
-            conn.close()
             return data
         except Exception as e:
             print(f"Error loading SQLite: {e}")
@@ -325,23 +381,76 @@ class DataManager:
             if not source_path.exists():
                 return False
             
+            # Commit pending SQLite writes before copying
+            self.flush()
+            
             backup_path = self.base_path / "backups" / f"{filename}.{backup_suffix}"
             backup_path.parent.mkdir(exist_ok=True)
             
-            import shutil
-            shutil.copy2(source_path, backup_path)
+            if zstd is not None:
+                import shutil
+                # Level 3 with long-distance matching; JSON/CSV compress ~10x
+                backup_path = backup_path.with_name(backup_path.name + '.zst')
+                params = zstd.ZstdCompressionParameters.from_level(3, enable_ldm=True, threads=-1)
+                cctx = zstd.ZstdCompressor(compression_params=params)
+                with open(source_path, 'rb') as src, open(backup_path, 'wb') as dst:
+                    cctx.copy_stream(src, dst, read_size=1 << 20, write_size=1 << 20)
+                shutil.copystat(source_path, backup_path)
+            else:
+                copy_file(source_path, backup_path)
             return True
         except Exception as e:
             print(f"Error creating backup: {e}")
             return False
     
+    def restore_backup(self, backup_name: str, filename: str) -> bool:
+        """Restore a file from a backup, decompressing .zst backups."""
+        try:
+            backup_path = self.base_path / "backups" / backup_name
+            if not backup_path.exists():
+                return False
+            
+            target_path = self.base_path / filename
+            if backup_path.suffix == '.zst':
+                if zstd is None:
+                    print("Error restoring backup: zstandard is not installed")
+                    return False
+                dctx = zstd.ZstdDecompressor()
+                with open(backup_path, 'rb') as src, open(target_path, 'wb') as dst:
+                    dctx.copy_stream(src, dst, read_size=1 << 20, write_size=1 << 20)
+            else:
+                import shutil
+                shutil.copyfile(backup_path, target_path)
+            return True
+        except Exception as e:
+            print(f"Error restoring backup: {e}")
+            return False
+    
     def list_files(self, pattern: str = "*") -> List[str]:
         """List all files matching a pattern."""
         try:
             files = []
-            for file_path in self.base_path.rglob(pattern):
-                if file_path.is_file():
-                    files.append(str(file_path.relative_to(self.base_path)))
+            root = str(self.base_path)
+            # Like rglob: a pattern with directory parts matches the trailing
+            # components of the path, one component per part
+            parts = pattern.split('/')
+            # scandir entries carry the type info from the directory read,
+            # so no extra stat() per entry is needed
+            pending = [root]
+            while pending:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file() and fnmatch.fnmatchcase(entry.name, parts[-1]):
+                            relative = os.path.relpath(entry.path, root)
+                            if len(parts) > 1:
+                                components = relative.split(os.sep)[:-1]
+                                if len(components) < len(parts) - 1 or not all(
+                                        fnmatch.fnmatchcase(component, part)
+                                        for component, part in zip(components[1 - len(parts):], parts[:-1])):
+                                    continue
+                            files.append(relative)
             return files
         except Exception as e:
             print(f"Error listing files: {e}")
@@ -351,10 +460,11 @@ class DataManager:
         """Get information about a file."""
         try:
             file_path = self.base_path / filename
-            if not file_path.exists():
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
                 return {}
             
-            stat = file_path.stat()
             return {
                 'filename': filename,
                 'size': stat.st_size,
@@ -364,4 +474,4 @@ class DataManager:
             }
         except Exception as e:
             print(f"Error getting file info: {e}")
-            return {} 
\ No newline at end of file
+            return {}
\ No newline at end of file
@@ -1,14 +1,174 @@
-import json
 import csv
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Union
 from datetime import datetime, timedelta
-from src.models import Product
+from src.models import Product, Batch, to_micros
+from src.utils.io_utils import atomic_write, dumps_json, loads_json
 import os
+import atexit
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import numpy as np
+import pandas as pd
 from collections import defaultdict
+from functools import lru_cache
+
+try:
+    import msgspec
+except ImportError:  # products are decoded via Product.from_dict instead
+    msgspec = None
+
+try:
+    from numba import njit
+except ImportError:  # the kernels below run as plain NumPy expressions
+    njit = None
+
+
+def _turnover_kernel(qty: np.ndarray, sold: np.ndarray, days: int):
+    """Per-product turnover rate and days to stockout."""
+    turnover_rate = sold / (qty + 0.1)  # Avoid division by zero
+    days_to_stockout = qty / (sold / days + 0.1)
+    return turnover_rate, days_to_stockout
+
+
+def _forecast_kernel(totals: np.ndarray, day_counts: np.ndarray, std_devs: np.ndarray,
+                     cur_stock: np.ndarray, days_forecast: int):
+    """Per-product predicted need, safety stock and recommended order."""
+    predicted_need = totals / np.maximum(day_counts, 1) * days_forecast
+    safety_stock = std_devs * 2  # 95% confidence interval
+    recommended_order = np.maximum(predicted_need + safety_stock - cur_stock, 0)
+    return predicted_need, safety_stock, recommended_order
+
+
+if njit is not None:
+    _turnover_kernel = njit(parallel=True, cache=True)(_turnover_kernel)
+    _forecast_kernel = njit(parallel=True, cache=True)(_forecast_kernel)
+
+if msgspec is not None:
+    class _ProductRecord(msgspec.Struct):
+        """Typed schema of one product entry in the inventory JSON file."""
+        product_id: Optional[str] = None
+        name: str = ""
+        category: str = ""
+        quantity: int = 0
+        price: float = 0.0
+        description: str = ""
+        requires_batch_tracking: bool = False
+        min_quantity: int = 0
+        reorder_point: int = 0
+        preferred_supplier_id: str = ""
+        batches: Dict[str, Dict[str, Any]] = {}
+        created_at: Union[str, msgspec.UnsetType] = msgspec.UNSET
+        updated_at: Union[str, msgspec.UnsetType] = msgspec.UNSET
+
+    # strict=False keeps from_dict's leniency for numbers stored as strings
+    _product_list_decoder = msgspec.json.Decoder(List[_ProductRecord], strict=False)
+
+
+def _decode_products(raw: bytes) -> List[Product]:
+    """Decode a JSON product list, parsing straight into typed records when msgspec is available."""
+    if msgspec is not None:
+        try:
+            records = _product_list_decoder.decode(raw)
+        except msgspec.ValidationError:
+            pass  # loosely typed file; let from_dict coerce it
+        else:
+            products = []
+            for rec in records:
+                product = Product(
+                    product_id=rec.product_id, name=rec.name, category=rec.category,
+                    quantity=rec.quantity, price=rec.price, description=rec.description,
+                    requires_batch_tracking=rec.requires_batch_tracking,
+                    min_quantity=rec.min_quantity, reorder_point=rec.reorder_point,
+                    preferred_supplier_id=rec.preferred_supplier_id
+                )
+                for batch_data in rec.batches.values():
+                    product.batches[batch_data["batch_id"]] = Batch(**batch_data)
+                if rec.created_at is not msgspec.UNSET:
+                    product.created_at = rec.created_at
+                if rec.updated_at is not msgspec.UNSET:
+                    product.updated_at = rec.updated_at
+                products.append(product)
+            return products
+    data = loads_json(raw)
+    return [Product.from_dict(item) for item in data]
+
+def _csv_cell(value: Any) -> str:
+    """Format a value the way csv.writer does: None as '', floats by repr, anything else by str."""
+    if value is None:
+        return ''
+    return repr(value) if isinstance(value, float) else str(value)
+
+# (level name, message prefix) per alert level index from check_inventory_alerts
+_ALERT_LEVELS = (
+    ('CRITICAL', 'Critical stock level: Only '),
+    ('LOW', 'Low stock level: '),
+    ('REORDER', 'Reorder point reached: '),
+)
+_ALERT_SUFFIX = ' units remaining'
+
+class _SalesColumns:
+    """
+    Columnar (SoA) mirror of InventoryManager.sales_history.
+
+    Each column is a NumPy array grown by amortized doubling; only the first
+    `size` entries are valid. Product ids are stored as small integer codes
+    and timestamps as microseconds since the (naive) epoch.
+
+    All-time per-code aggregates (sale count, quantity total, Welford mean
+    and M2 of the quantities, distinct sale days) are kept up to date as
+    sales are added, so whole-history statistics never rescan the columns.
+    """
+    _DTYPES = {'code': np.int64, 'ts': np.int64, 'qty': np.float64, 'total': np.float64}
+
+    def __init__(self, source: List[Dict[str, Any]]):
+        self.source = source
+        self.size = 0
+        self.codes: Dict[str, int] = {}
+        self._arrays = {name: np.empty(64, dtype=dtype) for name, dtype in self._DTYPES.items()}
+        # Per-code aggregates, indexed by code
+        self.sale_count: List[int] = []
+        self.qty_total: List[float] = []
+        self.qty_mean: List[float] = []
+        self.qty_m2: List[float] = []
+        self.day_count: List[int] = []
+        self._sale_days: Set[tuple] = set()
+
+    def append(self, product_id: str, **values) -> None:
+        if self.size == len(self._arrays['code']):
+            for name, array in self._arrays.items():
+                grown = np.empty(2 * len(array), dtype=array.dtype)
+                grown[:self.size] = array
+                self._arrays[name] = grown
+        values['code'] = self.codes.setdefault(product_id, len(self.codes))
+        for name, value in values.items():
+            self._arrays[name][self.size] = value
+        self.size += 1
+
+    def add_sale(self, sale: Dict[str, Any], sale_date: datetime) -> None:
+        """Append one sales_history record, given its parsed timestamp."""
+        quantity = sale['quantity']
+        self.append(sale['product_id'], ts=to_micros(sale_date), qty=quantity, total=sale['total'])
+        code = self.codes[sale['product_id']]
+        if code == len(self.sale_count):
+            self.sale_count.append(0)
+            self.qty_total.append(0.0)
+            self.qty_mean.append(0.0)
+            self.qty_m2.append(0.0)
+            self.day_count.append(0)
+        # Welford's online update of the quantity mean and sum of squared deviations
+        n = self.sale_count[code] = self.sale_count[code] + 1
+        delta = quantity - self.qty_mean[code]
+        self.qty_mean[code] += delta / n
+        self.qty_m2[code] += delta * (quantity - self.qty_mean[code])
+        self.qty_total[code] += quantity
+        day = (code, sale_date.toordinal())
+        if day not in self._sale_days:
+            self._sale_days.add(day)
+            self.day_count[code] += 1
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._arrays[name][:self.size]
 
 class InventoryManager:
     """
@@ -24,36 +184,174 @@ class InventoryManager:
             'reorder_point': 15
         }
         self.sales_history: List[Dict[str, Any]] = []
+        # Trigram -> row postings over lowercased name/category, rebuilt
+        # lazily by search_products after products change
+        self._inverted: Dict[str, Set[int]] = {}
+        self._search_rows: List[tuple] = []
+        # (product, name, category) each row was indexed from, so direct
+        # edits to a product's name or category are picked up as well
+        self._search_keys: List[tuple] = []
+        self._inv_dirty = True
+        # Bumped on every change to self.products, and whenever a search finds
+        # rows to reindex; keys the search result cache
+        self._version = 0
+        self._search_cached = lru_cache(maxsize=256)(self._search_impl)
+        # product_id -> index of its first occurrence in self.products;
+        # None until rebuilt by _id_index()
+        self._by_id: Optional[Dict[str, int]] = None
+        # Parallel (SoA) arrays of product fields for the bulk scans, rebuilt
+        # from the products by _sync_arrays() at the start of each scan
+        self._qty = np.empty(0, dtype=np.float64)
+        self._price = np.empty(0, dtype=np.float64)
+        self._pid = np.empty(0, dtype=object)
+        # Columnar copy of sales_history, caught up lazily by _sales_columns()
+        self._sales_cols = _SalesColumns(self.sales_history)
+        # Authenticated SMTP connection reused across send_alert_emails calls
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _mark_dirty(self, reindex: bool = True) -> None:
+        """Invalidate the indexes derived from self.products."""
+        self._inv_dirty = True
+        self._version += 1
+        if reindex:
+            self._by_id = None
+
+    def _id_index(self) -> Dict[str, int]:
+        """Return the product_id -> list index map, rebuilding it if needed."""
+        if self._by_id is None:
+            by_id = {}
+            for i, product in enumerate(self.products):
+                by_id.setdefault(product.product_id, i)
+            self._by_id = by_id
+        return self._by_id
+
+    def _find(self, product_id: str) -> Optional[int]:
+        """
+        Return the list index of the product with product_id, or None.
+
+        product_id can also change by direct attribute edits the manager
+        never sees, so a miss or an entry whose product no longer has that
+        id rebuilds the index and looks again.
+        """
+        i = self._id_index().get(product_id)
+        if i is not None and i < len(self.products) and self.products[i].product_id == product_id:
+            return i
+        self._by_id = None
+        return self._id_index().get(product_id)
+
+    def _sync_arrays(self) -> None:
+        """
+        Rebuild the SoA product arrays from the current products.
+
+        Rebuilt on every scan rather than on _mark_dirty, since quantities
+        also change through Product methods (add_batch, remove_batch, ...)
+        and direct attribute edits that the manager never sees.
+        """
+        products = self.products
+        n = len(products)
+        # float64 so a non-integer quantity is compared as is, not truncated
+        self._qty = np.fromiter((p.quantity for p in products), dtype=np.float64, count=n)
+        self._price = np.fromiter((p.price for p in products), dtype=np.float64, count=n)
+        self._pid = np.empty(n, dtype=object)
+        self._pid[:] = [p.product_id for p in products]
 
     def add_product(self, product: Product) -> None:
         """Add a product to inventory. Product must include description."""
         self.products.append(product)
+        self._mark_dirty(reindex=False)
+        if self._by_id is not None:
+            self._by_id.setdefault(product.product_id, len(self.products) - 1)
 
     def edit_product(self, product_id: str, **kwargs) -> bool:
         """Edit a product by ID. Supports updating description."""
-        for product in self.products:
-            if product.product_id == product_id:
-                for key, value in kwargs.items():
-                    if hasattr(product, key):
-                        setattr(product, key, value)
-                return True
-        return False
+        product = self.get_product_by_id(product_id)
+        if product is None:
+            return False
+        for key, value in kwargs.items():
+            if hasattr(product, key):
+                setattr(product, key, value)
+        self._mark_dirty(reindex=False)
+        return True
 
     def delete_product(self, product_id: str) -> bool:
-        for i, product in enumerate(self.products):
-            if product.product_id == product_id:
-                del self.products[i]
-                return True
-        return False
+        i = self._find(product_id)
+        if i is None:
+            return False
+        # Keep list order (it is the display order); indexes shift, so rebuild lazily
+        del self.products[i]
+        self._mark_dirty()
+        return True
+
+    def _rebuild_inverted(self) -> None:
+        """Rebuild the trigram postings and lowercased rows used by search_products."""
+        inverted = defaultdict(set)
+        rows = []
+        for i, p in enumerate(self.products):
+            name, category = p.name.lower(), p.category.lower()
+            rows.append((p, name, category))
+            for text in (name, category):
+                for j in range(len(text) - 2):
+                    inverted[text[j:j + 3]].add(i)
+        self._inverted = dict(inverted)
+        self._search_rows = rows
+        self._search_keys = [(p, p.name, p.category) for p in self.products]
+        self._inv_dirty = False
+
+    def _refresh_inverted(self) -> bool:
+        """
+        Bring the trigram postings up to date with self.products.
+
+        Rows whose product, name or category is no longer the one they were
+        indexed from are reindexed in place.
+
+        Returns:
+            bool: True if any row was (re)indexed
+        """
+        products = self.products
+        if self._inv_dirty or len(products) != len(self._search_keys):
+            self._rebuild_inverted()
+            return True
+        changed = [i for i, (p, key) in enumerate(zip(products, self._search_keys))
+                   if key[0] is not p or key[1] is not p.name or key[2] is not p.category]
+        inverted = self._inverted
+        for i in changed:
+            _, old_name, old_category = self._search_rows[i]
+            for text in (old_name, old_category):
+                for j in range(len(text) - 2):
+                    inverted[text[j:j + 3]].discard(i)
+            p = products[i]
+            name, category = p.name.lower(), p.category.lower()
+            for text in (name, category):
+                for j in range(len(text) - 2):
+                    inverted.setdefault(text[j:j + 3], set()).add(i)
+            self._search_rows[i] = (p, name, category)
+            self._search_keys[i] = (p, p.name, p.category)
+        return bool(changed)
 
     def search_products(self, query: str) -> List[Product]:
-        query = query.lower()
-        return [p for p in self.products if query in p.name.lower() or query in p.category.lower()]
+        if self._refresh_inverted():
+            self._version += 1
+        return list(self._search_cached(query.lower(), self._version))
+
+    def _search_impl(self, query: str, version: int) -> tuple:
+        """Uncached search for a lowercased query; version only keys the cache."""
+        rows = self._search_rows
+        if len(query) >= 3:
+            # A substring match contains every trigram of the query, so only
+            # rows in all postings need the final substring check
+            postings = sorted(
+                (self._inverted.get(query[j:j + 3], set()) for j in range(len(query) - 2)),
+                key=len
+            )
+            rows = [rows[i] for i in sorted(postings[0].intersection(*postings[1:]))]
+        return tuple(p for p, name, category in rows if query in name or query in category)
 
     def save_to_json(self, filepath: str) -> bool:
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump([p.to_dict() for p in self.products], f, indent=4)
+            data = [p.to_dict() for p in self.products]
+            payload = dumps_json(data, indent=True)
+            with atomic_write(filepath, 'wb') as f:
+                f.write(payload)
             return True
         except Exception as e:
             print(f"Error saving to JSON: {e}")
@@ -63,9 +361,10 @@ class InventoryManager:
         try:
             if not os.path.exists(filepath):
                 return False
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.products = [Product.from_dict(item) for item in data]
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            self.products = _decode_products(raw)
+            self._mark_dirty()
             return True
         except Exception as e:
             print(f"Error loading from JSON: {e}")
@@ -73,7 +372,7 @@ class InventoryManager:
 
     def save_to_txt(self, filepath: str) -> bool:
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with atomic_write(filepath, 'w', encoding='utf-8') as f:
                 for p in self.products:
                     line = f"{p.product_id}|{p.name}|{p.category}|{p.quantity}|{p.price}|{p.description}\n"
                     f.write(line)
@@ -86,19 +385,24 @@ class InventoryManager:
         try:
             if not os.path.exists(filepath):
                 return False
-            with open(filepath, 'r', encoding='utf-8') as f:
-                self.products = []
-                for line in f:
-                    parts = line.strip().split('|')
-                    if len(parts) >= 6:
-                        self.products.append(Product(
-                            product_id=parts[0],
-                            name=parts[1],
-                            category=parts[2],
-                            quantity=int(parts[3]),
-                            price=float(parts[4]),
-                            description=parts[5]
-                        ))
+            self.products = []
+            self._mark_dirty()
+            with open(filepath, 'rb') as f:
+                buf = f.read()
+            if not buf:
+                return True
+            # One decode and one split for the whole file; vectorised strip/split
+            # per line. Short lines leave None in the trailing columns and are skipped.
+            fields = pd.Series(buf.decode('utf-8').split('\n'), dtype=object).str.strip().str.split('|', expand=True)
+            if fields.shape[1] < 6:
+                return True
+            fields = fields.loc[fields[5].notna(), :5]
+            self.products = [
+                Product(product_id=pid, name=name, category=category,
+                        quantity=int(qty), price=float(price), description=desc)
+                for pid, name, category, qty, price, desc in zip(
+                    *(fields[i].tolist() for i in range(6)))
+            ]
             return True
         except Exception as e:
             print(f"Error loading from TXT: {e}")
@@ -106,11 +410,19 @@ class InventoryManager:
 
     def export_to_csv(self, filepath: str) -> bool:
         try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["Product ID", "Name", "Category", "Quantity", "Price", "Description"])
-                for p in self.products:
-                    writer.writerow([p.product_id, p.name, p.category, p.quantity, p.price, p.description])
+            products = self.products
+            # Cells are formatted as csv.writer does (None as '', NaN as 'nan'),
+            # since to_csv would write every NA value as na_rep
+            df = pd.DataFrame({
+                "Product ID": [_csv_cell(p.product_id) for p in products],
+                "Name": [_csv_cell(p.name) for p in products],
+                "Category": [_csv_cell(p.category) for p in products],
+                "Quantity": [_csv_cell(p.quantity) for p in products],
+                "Price": [_csv_cell(p.price) for p in products],
+                "Description": [_csv_cell(p.description) for p in products]
+            }, dtype=object)
+            with atomic_write(filepath, 'w', newline='', encoding='utf-8') as f:
+                df.to_csv(f, index=False, lineterminator='\r\n')
             return True
         except Exception as e:
             print(f"Error exporting to CSV: {e}")
@@ -121,21 +433,33 @@ class InventoryManager:
 
     def load_from_csv(self, filepath: str) -> bool:
         try:
-            import csv
             if not os.path.exists(filepath):
                 return False
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.products = []
-                for row in reader:
-                    self.products.append(Product(
-                        product_id=row.get('product_id', ''),
-                        name=row.get('name', ''),
-                        category=row.get('category', ''),
-                        quantity=int(row.get('quantity', 0)),
-                        price=float(row.get('price', 0.0)),
-                        description=row.get('description', '')
-                    ))
+            try:
+                # Everything as str; int()/float() below apply the usual rules
+                df = pd.read_csv(filepath, dtype=str, keep_default_na=False, encoding='utf-8')
+            except pd.errors.EmptyDataError:
+                df = pd.DataFrame()
+            rows = len(df)
+
+            def column(name, default):
+                return df[name].tolist() if name in df.columns else [default] * rows
+
+            self.products = [
+                Product(
+                    product_id=product_id,
+                    name=name,
+                    category=category,
+                    quantity=int(quantity),
+                    price=float(price),
+                    description=description
+                )
+                for product_id, name, category, quantity, price, description in zip(
+                    column('product_id', ''), column('name', ''), column('category', ''),
+                    column('quantity', 0), column('price', 0.0), column('description', '')
+                )
+            ]
+            self._mark_dirty()
             return True
         except Exception as e:
             print(f"Error loading from CSV: {e}")
@@ -147,18 +471,18 @@ class InventoryManager:
             if not os.path.exists(filepath):
                 return False
             with open(filepath, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                # libyaml-backed loader when PyYAML was built with it
+                data = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
                 self.products = [Product.from_dict(item) for item in data]
+                self._mark_dirty()
             return True
         except Exception as e:
             print(f"Error loading from YAML: {e}")
             return False
 
     def get_product_by_id(self, product_id: str):
-        for product in self.products:
-            if product.product_id == product_id:
-                return product
-        return None
+        i = self._find(product_id)
+        return self.products[i] if i is not None else None
 
     def configure_alerts(self, thresholds: Dict[str, int]) -> None:
         """Configure alert thresholds for inventory levels."""
@@ -166,32 +490,28 @@ class InventoryManager:
 
     def check_inventory_alerts(self) -> List[Dict[str, Any]]:
         """Check for products that need attention based on configured thresholds."""
+        self._sync_arrays()
+        thresholds = self.alert_thresholds
+        # Level = first threshold the quantity is at or below. The running max
+        # keeps the boundaries sorted without changing that answer.
+        boundaries = np.maximum.accumulate(np.array([
+            thresholds['critical_stock'], thresholds['low_stock'], thresholds['reorder_point']
+        ]))
+        levels = np.searchsorted(boundaries, self._qty, side='left')
+
         alerts = []
-        for product in self.products:
-            if product.quantity <= self.alert_thresholds['critical_stock']:
-                alerts.append({
-                    'product_id': product.product_id,
-                    'name': product.name,
-                    'current_stock': product.quantity,
-                    'level': 'CRITICAL',
-                    'message': f'Critical stock level: Only {product.quantity} units remaining'
-                })
-            elif product.quantity <= self.alert_thresholds['low_stock']:
-                alerts.append({
-                    'product_id': product.product_id,
-                    'name': product.name,
-                    'current_stock': product.quantity,
-                    'level': 'LOW',
-                    'message': f'Low stock level: {product.quantity} units remaining'
-                })
-            elif product.quantity <= self.alert_thresholds['reorder_point']:
-                alerts.append({
-                    'product_id': product.product_id,
-                    'name': product.name,
-                    'current_stock': product.quantity,
-                    'level': 'REORDER',
-                    'message': f'Reorder point reached: {product.quantity} units remaining'
-                })
+        matched = np.flatnonzero(levels < 3)
+        for i, level in zip(matched.tolist(), levels[matched].tolist()):
+            product = self.products[i]
+            level_name, prefix = _ALERT_LEVELS[level]
+            quantity = product.quantity
+            alerts.append({
+                'product_id': product.product_id,
+                'name': product.name,
+                'current_stock': quantity,
+                'level': level_name,
+                'message': prefix + str(quantity) + _ALERT_SUFFIX
+            })
         return alerts
 
     def send_alert_emails(self, alerts: List[Dict[str, Any]]) -> bool:
@@ -205,138 +525,209 @@ class InventoryManager:
             msg['To'] = self.email_config['to']
             msg['Subject'] = 'Inventory Alert Report'
 
-            body = "Inventory Alert Report\n\n"
-            for alert in alerts:
-                body += f"{alert['level']}: {alert['name']} - {alert['message']}\n"
-
-            msg.attach(MIMEText(body, 'plain'))
+            parts = ["Inventory Alert Report\n\n"]
+            parts.extend(f"{alert['level']}: {alert['name']} - {alert['message']}\n" for alert in alerts)
+            msg.attach(MIMEText(''.join(parts), 'plain'))
 
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            server.login(self.email_config['username'], self.email_config['password'])
-            server.send_message(msg)
-            server.quit()
+            try:
+                self._get_smtp().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between the liveness probe and the send; reconnect once
+                self.close_smtp()
+                self._get_smtp().send_message(msg)
             return True
         except Exception as e:
             print(f"Error sending alert email: {e}")
+            self.close_smtp()
             return False
 
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return the pooled SMTP connection, (re)connecting if it is missing or stale."""
+        server = self._smtp
+        if server is not None:
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close_smtp()
+        server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
+        server.starttls()
+        server.login(self.email_config['username'], self.email_config['password'])
+        self._smtp = server
+        # Log out cleanly at interpreter exit if nothing closed it before
+        atexit.register(self.close_smtp)
+        return server
+
+    def close_smtp(self) -> None:
+        """Close the pooled SMTP connection, if any."""
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
+        atexit.unregister(self.close_smtp)
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
     def record_sale(self, product_id: str, quantity: int, sale_price: float) -> bool:
         """Record a sale for analytics purposes."""
-        product = self.get_product_by_id(product_id)
+        i = self._find(product_id)
+        product = self.products[i] if i is not None else None
         if not product or product.quantity < quantity:
             return False
 
+        now = datetime.now()
         sale_record = {
             'product_id': product_id,
             'quantity': quantity,
             'sale_price': sale_price,
             'total': quantity * sale_price,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now.isoformat()
         }
         self.sales_history.append(sale_record)
+        cols = self._sales_cols
+        if cols.source is self.sales_history and cols.size == len(self.sales_history) - 1:
+            # Columns are caught up: store the day ordinal etc. now, not at analytics time
+            cols.add_sale(sale_record, now)
         product.quantity -= quantity
         return True
 
     def analyze_inventory_turnover(self, days: int = 30) -> Dict[str, Any]:
         """Calculate inventory turnover metrics for the specified period."""
         cutoff_date = datetime.now() - timedelta(days=days)
-        
-        # Group sales by product
-        product_sales = defaultdict(lambda: {'quantity': 0, 'revenue': 0})
-        for sale in self.sales_history:
-            sale_date = datetime.fromisoformat(sale['timestamp'])
-            if sale_date >= cutoff_date:
-                prod_id = sale['product_id']
-                product_sales[prod_id]['quantity'] += sale['quantity']
-                product_sales[prod_id]['revenue'] += sale['total']
+
+        # Per-product sums over the sales inside the window
+        cols = self._sales_columns()
+        in_window = cols['ts'] >= to_micros(cutoff_date)
+        codes = cols['code'][in_window]
+        n_slots = len(cols.codes) + 1
+        sale_counts = np.bincount(codes, minlength=n_slots)
+        units_sold = np.bincount(codes, weights=cols['qty'][in_window], minlength=n_slots)
+        revenue = np.bincount(codes, weights=cols['total'][in_window], minlength=n_slots)
 
         # Calculate metrics
+        rows = self._product_rows(cols)
+        units_sold = units_sold[rows]
+        turnover_rates, days_to_stockout = _turnover_kernel(self._qty, units_sold, days)
+        turnover_rates, days_to_stockout = turnover_rates.tolist(), days_to_stockout.tolist()
+        sale_counts = sale_counts[rows]
+        units_sold = units_sold.astype(np.int64)
+        revenue = revenue[rows]
+        # Totals as array reductions rather than a second pass over the dicts
+        total_revenue = float(revenue.sum()) if sale_counts.any() else 0
+        total_units_sold = int(units_sold.sum())
+        sale_counts, units_sold, revenue = sale_counts.tolist(), units_sold.tolist(), revenue.tolist()
+
         turnover_metrics = []
-        for product in self.products:
-            sales_data = product_sales[product.product_id]
+        for i, product in enumerate(self.products):
+            sold = sale_counts[i] > 0
             metrics = {
                 'product_id': product.product_id,
                 'name': product.name,
                 'current_stock': product.quantity,
-                'units_sold': sales_data['quantity'],
-                'revenue': sales_data['revenue'],
-                'turnover_rate': sales_data['quantity'] / (product.quantity + 0.1),  # Avoid division by zero
-                'days_to_stockout': product.quantity / (sales_data['quantity'] / days + 0.1)
+                'units_sold': units_sold[i],
+                'revenue': revenue[i] if sold else 0,
+                'turnover_rate': turnover_rates[i],
+                'days_to_stockout': days_to_stockout[i]
             }
             turnover_metrics.append(metrics)
 
         return {
             'period_days': days,
             'metrics': turnover_metrics,
-            'total_revenue': sum(m['revenue'] for m in turnover_metrics),
-            'total_units_sold': sum(m['units_sold'] for m in turnover_metrics)
+            'total_revenue': total_revenue,
+            'total_units_sold': total_units_sold
         }
 
     def identify_dead_stock(self, days_threshold: int = 90) -> List[Dict[str, Any]]:
         """Identify products with no sales in the specified period."""
         cutoff_date = datetime.now() - timedelta(days=days_threshold)
         
-        # Get products with sales
-        active_products = set()
-        for sale in self.sales_history:
-            sale_date = datetime.fromisoformat(sale['timestamp'])
-            if sale_date >= cutoff_date:
-                active_products.add(sale['product_id'])
+        # Get products with sales (the columns hold each record's parsed timestamp)
+        cols = self._sales_columns()
+        sold_ids = list(cols.codes)
+        active_products = {sold_ids[code] for code in
+                           np.unique(cols['code'][cols['ts'] >= to_micros(cutoff_date)]).tolist()}
 
         # Find dead stock
+        self._sync_arrays()
+        # Rebuilt like the arrays, since ids may have been edited directly
+        self._by_id = None
+        by_id = self._id_index()
+        if len(by_id) == len(self.products):
+            # Unique ids: only visit products with no recent sales
+            candidates = np.array(sorted(by_id[pid] for pid in by_id.keys() - active_products), dtype=np.intp)
+            rows = candidates[self._qty[candidates] > 0]
+        else:
+            # Duplicate ids are not all in the index; test every row
+            rows = np.flatnonzero((self._qty > 0) & ~np.isin(self._pid, list(active_products)))
+        values = (self._qty[rows] * self._price[rows]).tolist()
+        rows = rows.tolist()
         dead_stock = []
-        for product in self.products:
-            if product.product_id not in active_products and product.quantity > 0:
-                dead_stock.append({
-                    'product_id': product.product_id,
-                    'name': product.name,
-                    'quantity': product.quantity,
-                    'value': product.quantity * product.price,
-                    'days_inactive': days_threshold
-                })
+        for i, value in zip(rows, values):
+            product = self.products[i]
+            dead_stock.append({
+                'product_id': product.product_id,
+                'name': product.name,
+                'quantity': product.quantity,
+                'value': value,
+                'days_inactive': days_threshold
+            })
 
         return dead_stock
 
+    def _sales_columns(self) -> _SalesColumns:
+        """Return the columnar sales view, appending records added since the last call."""
+        cols = self._sales_cols
+        if cols.source is not self.sales_history or cols.size > len(self.sales_history):
+            # sales_history was replaced or truncated
+            cols = self._sales_cols = _SalesColumns(self.sales_history)
+        for i in range(cols.size, len(self.sales_history)):
+            sale = self.sales_history[i]
+            cols.add_sale(sale, datetime.fromisoformat(sale['timestamp']))
+        return cols
+
+    def _product_rows(self, cols: _SalesColumns) -> np.ndarray:
+        """Sales code of each product, in product order; len(cols.codes) for products never sold."""
+        self._sync_arrays()
+        spare = len(cols.codes)
+        return np.fromiter((cols.codes.get(pid, spare) for pid in self._pid.tolist()),
+                           dtype=np.intp, count=len(self._pid))
+
     def predict_stock_needs(self, days_forecast: int = 30) -> List[Dict[str, Any]]:
         """Predict future stock needs based on historical sales data."""
-        # Calculate daily sales rates
-        product_daily_sales = defaultdict(list)
-        
-        # Group sales by day for each product
-        for sale in self.sales_history:
-            sale_date = datetime.fromisoformat(sale['timestamp']).date()
-            product_daily_sales[sale['product_id']].append({
-                'date': sale_date,
-                'quantity': sale['quantity']
-            })
+        # Per-product aggregates maintained as sales are recorded, plus one
+        # spare slot (index n_codes) with zero counts for products without sales
+        cols = self._sales_columns()
+        sale_counts = np.array(cols.sale_count + [0], dtype=np.int64)
+        total_sales = np.array(cols.qty_total + [0.0], dtype=np.float64)
+        unique_days = np.array(cols.day_count + [0], dtype=np.int64)
+        # Population standard deviation of the per-sale quantities
+        std_devs = np.sqrt(np.array(cols.qty_m2 + [0.0], dtype=np.float64) / np.maximum(sale_counts, 1))
+
+        # Align the per-code statistics with self.products
+        rows = self._product_rows(cols)
+        predicted_need, safety_stock, recommended_order = _forecast_kernel(
+            total_sales[rows], unique_days[rows].astype(np.float64), std_devs[rows],
+            self._qty, days_forecast
+        )
+        sale_counts = sale_counts[rows].tolist()
+        predicted_need, safety_stock = predicted_need.tolist(), safety_stock.tolist()
+        recommended_order = recommended_order.tolist()
 
         predictions = []
-        for product in self.products:
-            daily_sales = product_daily_sales[product.product_id]
-            
-            if daily_sales:
-                # Calculate average daily sales
-                total_sales = sum(sale['quantity'] for sale in daily_sales)
-                unique_days = len(set(sale['date'] for sale in daily_sales))
-                avg_daily_sales = total_sales / max(unique_days, 1)
-                
-                # Calculate standard deviation for confidence interval
-                daily_quantities = [sale['quantity'] for sale in daily_sales]
-                std_dev = np.std(daily_quantities) if len(daily_quantities) > 1 else 0
-                
-                # Predict future needs
-                predicted_need = avg_daily_sales * days_forecast
-                safety_stock = std_dev * 2  # 95% confidence interval
-                
+        for i, product in enumerate(self.products):
+            n_sales = sale_counts[i]
+            if n_sales:
                 predictions.append({
                     'product_id': product.product_id,
                     'name': product.name,
                     'current_stock': product.quantity,
-                    'predicted_need': predicted_need,
-                    'safety_stock': safety_stock,
-                    'recommended_order': max(0, predicted_need + safety_stock - product.quantity),
-                    'confidence': 'HIGH' if len(daily_sales) >= 30 else 'MEDIUM' if len(daily_sales) >= 14 else 'LOW'
+                    'predicted_need': predicted_need[i],
+                    'safety_stock': safety_stock[i] if n_sales > 1 else 0,
+                    'recommended_order': recommended_order[i] or 0,
+                    'confidence': 'HIGH' if n_sales >= 30 else 'MEDIUM' if n_sales >= 14 else 'LOW'
                 })
             else:
                 predictions.append({
@@ -349,4 +740,4 @@ class InventoryManager:
                     'confidence': 'NO_DATA'
                 })
 
-        return predictions 
\ No newline at end of file
+        return predictions
\ No newline at end of file
@@ -9,7 +9,7 @@ a consistent interface.
 Features:
 - Support for POS products (with price, stock, ID)
 - Support for general inventory items (with quantity, category)
-- JSON-based data storage
+- JSON-based data storage (or SQLite, with row-level writes)
 - Automatic data validation
 - Search and filtering capabilities
 - Export/import functionality
@@ -17,18 +17,50 @@ Features:
 
 import json
 import os
-import uuid
+import itertools
+import mmap
+import secrets
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Union, Any
-from dataclasses import dataclass, asdict
+from typing import IO, Callable, Dict, List, Optional, Set, Union, Any
+from dataclasses import dataclass, fields, MISSING
 from enum import Enum
+from src.utils.io_utils import atomic_write, dumps_json, load_json_file, loads_json, orjson
+import numpy as np
+import pandas as pd
+
+try:
+    import ijson
+except ImportError:  # imports parse the whole file at once instead
+    ijson = None
+
+try:
+    import msgspec
+except ImportError:  # records are built from generically parsed dicts instead
+    msgspec = None
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize data (dataclass records included) to indented UTF-8 JSON bytes."""
+    if orjson is None and msgspec is not None:
+        # Also encodes the records in C; format() re-indents to the same 2-space layout
+        return msgspec.json.format(msgspec.json.encode(data), indent=2)
+    # orjson encodes dataclass instances natively, no asdict() copy; for the
+    # stdlib encoder records hold only flat fields, so a shallow dict is enough
+    return dumps_json(data, indent=True, default=_record_dict)
+
+
+def _record_dict(record: Any) -> Dict[str, Any]:
+    """Shallow field-order dict of a dataclass record (for the stdlib encoder)."""
+    return {field.name: getattr(record, field.name) for field in fields(record)}
 
 class InventoryType(Enum):
     """Types of inventory items supported by the system."""
     POS_PRODUCT = "pos_product"
     GENERAL_ITEM = "general_item"
 
-@dataclass
+@dataclass(slots=True)
 class POSProduct:
     """Data structure for Point of Sale products."""
     id: str
@@ -41,12 +73,12 @@ class POSProduct:
     updated_at: str = ""
     
     def __post_init__(self):
-        if not self.created_at:
-            self.created_at = datetime.now().isoformat()
-        if not self.updated_at:
-            self.updated_at = datetime.now().isoformat()
+        if not self.created_at or not self.updated_at:
+            now = datetime.now().isoformat()
+            self.created_at = self.created_at or now
+            self.updated_at = self.updated_at or now
 
-@dataclass
+@dataclass(slots=True)
 class GeneralItem:
     """Data structure for general inventory items."""
     id: str
@@ -61,10 +93,123 @@ class GeneralItem:
     updated_at: str = ""
     
     def __post_init__(self):
-        if not self.created_at:
-            self.created_at = datetime.now().isoformat()
-        if not self.updated_at:
-            self.updated_at = datetime.now().isoformat()
+        if not self.created_at or not self.updated_at:
+            now = datetime.now().isoformat()
+            self.created_at = self.created_at or now
+            self.updated_at = self.updated_at or now
+
+# Field names accepted by update_pos_product / update_general_item
+POSProduct._FIELDS = frozenset(field.name for field in fields(POSProduct))
+GeneralItem._FIELDS = frozenset(field.name for field in fields(GeneralItem))
+
+if msgspec is not None:
+    def _record_struct(record_type: type) -> type:
+        """Struct mirroring a record dataclass that rejects unknown keys, like record_type(**data)."""
+        return msgspec.defstruct(
+            f"_{record_type.__name__}Record",
+            [(field.name, field.type, field.default) if field.default is not MISSING
+             else (field.name, field.type) for field in fields(record_type)],
+            forbid_unknown_fields=True,
+        )
+
+    class _UnifiedInventory(msgspec.Struct):
+        """Typed schema of the unified inventory file."""
+        pos_products: Dict[str, _record_struct(POSProduct)] = {}
+        general_items: Dict[str, _record_struct(GeneralItem)] = {}
+
+    _inventory_decoder = msgspec.json.Decoder(_UnifiedInventory)
+
+
+def _decode_inventory(f: IO[bytes]) -> tuple:
+    """
+    Parse an open unified inventory file into its records.
+
+    With msgspec the file is decoded into typed structs, with no intermediate
+    dicts, and copied into POSProduct/GeneralItem. Files it rejects (loosely
+    typed values, unknown keys, bad JSON) take the generic path, which
+    reports errors as before.
+
+    Returns:
+        tuple: (pos_products, general_items) dicts keyed by id
+    """
+    if msgspec is not None:
+        raw = f.read()
+        try:
+            inventory = _inventory_decoder.decode(raw)
+        except msgspec.DecodeError:
+            data = loads_json(raw)
+        else:
+            astuple = msgspec.structs.astuple
+            return ({product_id: POSProduct(*astuple(product))
+                     for product_id, product in inventory.pos_products.items()},
+                    {item_id: GeneralItem(*astuple(item))
+                     for item_id, item in inventory.general_items.items()})
+    else:
+        data = load_json_file(f)
+    pos_products = {product_id: POSProduct(**product_data)
+                    for product_id, product_data in data.get('pos_products', {}).items()}
+    general_items = {item_id: GeneralItem(**item_data)
+                     for item_id, item_data in data.get('general_items', {}).items()}
+    return pos_products, general_items
+
+# Imports larger than this are parsed in parallel shards
+_PARALLEL_IMPORT_BYTES = 50 * 1024 * 1024
+
+# Layout written by export_to_json/save_data (2-space indent). JSON strings
+# cannot contain a raw newline, so these markers only ever match structure.
+_SECTION_OPEN = {'pos_products': b'\n  "pos_products": {', 'general_items': b'\n  "general_items": {'}
+_SECTION_CLOSE = b'\n  }'
+_RECORD_BOUNDARY = b'\n    },\n    "'
+
+
+def _shard_spans(buf: Any, shards: int) -> Optional[Dict[str, List[tuple]]]:
+    """
+    Split each section of an indented inventory file into byte spans that
+    each hold whole records.
+    
+    Args:
+        buf: The file contents (bytes or mmap)
+        shards: Target number of spans per section
+        
+    Returns:
+        Section name -> list of (start, end) spans, or None if the file
+        does not use the expected layout
+    """
+    spans = {}
+    for section, marker in _SECTION_OPEN.items():
+        start = buf.find(marker)
+        if start < 0:
+            return None
+        start += len(marker)
+        if buf[start:start + 1] == b'}':  # empty section written inline
+            spans[section] = []
+            continue
+        end = buf.find(_SECTION_CLOSE, start)
+        if end < 0:
+            return None
+        parts = []
+        step = max((end - start) // shards, 1)
+        while start < end:
+            cut = buf.find(_RECORD_BOUNDARY, min(start + step, end), end)
+            if cut < 0:
+                parts.append((start, end))
+                break
+            cut += len(b'\n    }')
+            parts.append((start, cut))
+            start = cut + 1  # skip the separating comma
+        spans[section] = parts
+    return spans
+
+
+def _parse_shard(filepath: str, section: str, start: int, end: int) -> Dict[str, Any]:
+    """Parse one span of records from an inventory file (runs in a worker process)."""
+    record_type = POSProduct if section == 'pos_products' else GeneralItem
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    return {record_id: record_type(**values)
+            for record_id, values in loads_json(b'{' + chunk + b'}').items()}
+
 
 class InventoryManager:
     """
@@ -72,59 +217,391 @@ class InventoryManager:
     and general inventory items.
     """
     
-    def __init__(self, data_file: str = "unified_inventory.json"):
+    # SQLite table holding each record kind
+    _TABLES = {'pos': ('pos_products', POSProduct), 'general': ('general_items', GeneralItem)}
+    
+    def __init__(self, data_file: str = "unified_inventory.json", backend: str = 'json'):
         """
         Initialize the inventory manager.
         
         Args:
-            data_file: Path to the JSON file for storing inventory data
+            data_file: Path to the JSON file (or SQLite database) for storing inventory data
+            backend: 'json' to rewrite one JSON file per save, 'sqlite' to write
+                only the changed rows to a database
         """
+        if backend not in ('json', 'sqlite'):
+            raise ValueError(f"Unknown storage backend: {backend}")
         self.data_file = data_file
         self.pos_products: Dict[str, POSProduct] = {}
         self.general_items: Dict[str, GeneralItem] = {}
+        # Unsaved changes; written by flush() or at the end of a `with` batch
+        self._dirty = False
+        self._autosave = True
+        self._batch_depth = 0
+        # Record payload (the bytes before "last_updated") of the last save,
+        # with the file's (size, mtime_ns) right after it was written
+        self._saved_records: Optional[bytes] = None
+        self._saved_stat: Optional[tuple] = None
+        # Lazily built lookup indexes per record kind ('pos' / 'general'),
+        # dropped by _invalidate() when the records they cover change
+        self._indexes: Dict[str, Dict[Any, Any]] = {'pos': {}, 'general': {}}
+        # Timestamp shared by every change inside the current `with` batch
+        self._batch_now: Optional[str] = None
+        # New ids are one random per-instance seed plus a running counter
+        self._id_seed = secrets.token_hex(4)
+        self._id_counter = itertools.count()
+        # SQLite backend: open connection, and the (kind, id) rows changed since
+        # the last save (None means every row must be rewritten)
+        self._db: Optional[sqlite3.Connection] = None
+        self._pending: Optional[Set[tuple]] = set()
+        if backend == 'sqlite':
+            self._db = self._open_db(data_file)
         self.load_data()
     
+    def __enter__(self) -> 'InventoryManager':
+        """Batch mutations: the data file is written once when the block exits."""
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._batch_now = None
+            self.flush()
+    
+    def _new_id(self, prefix: str, existing: Dict[str, Any]) -> str:
+        """
+        Generate a record id not already used in `existing`.
+        
+        Args:
+            prefix: Id prefix ('prod' or 'item')
+            existing: Records the id must not collide with
+            
+        Returns:
+            New id
+        """
+        while True:
+            record_id = f"{prefix}_{self._id_seed}{next(self._id_counter):04x}"
+            # A seed reused from an earlier session could clash with a saved id
+            if record_id not in existing:
+                return record_id
+    
+    def _now_iso(self) -> str:
+        """Current time as ISO text, computed once per `with` batch."""
+        if self._batch_now is not None:
+            return self._batch_now
+        now = datetime.now().isoformat()
+        if self._batch_depth:
+            self._batch_now = now
+        return now
+    
+    def _mark_dirty(self, kind: Optional[str] = None, record_id: Optional[str] = None) -> None:
+        """
+        Record an unsaved change, saving now unless autosave is off or a batch is open.
+        
+        Args:
+            kind: 'pos' or 'general' for a single-record change
+            record_id: Id of the changed (or deleted) record; omit both for bulk changes
+        """
+        self._dirty = True
+        if self._db is not None:
+            if kind is None:
+                self._pending = None
+            elif self._pending is not None:
+                self._pending.add((kind, record_id))
+        if self._autosave and self._batch_depth == 0:
+            self.save_data()
+    
+    def flush(self) -> bool:
+        """Write pending changes to the data file, if any."""
+        if not self._dirty:
+            return True
+        return self.save_data()
+    
+    def close(self) -> None:
+        """Flush pending changes and close the SQLite connection, if any."""
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+    
+    @classmethod
+    def _open_db(cls, path: str) -> sqlite3.Connection:
+        """Open the SQLite store, creating its tables and indexes if needed."""
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for table, record_type in cls._TABLES.values():
+            columns = [field.name for field in fields(record_type)]
+            # Untyped columns keep values exactly as stored (no int -> REAL coercion)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                         f"({columns[0]} TEXT PRIMARY KEY, {', '.join(columns[1:])})")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_category ON {table} (category)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_pos_products_stock ON pos_products (stock)")
+        conn.commit()
+        return conn
+    
+    def _save_rows(self) -> None:
+        """Write changed rows (or all rows after a bulk change) in one transaction."""
+        pending = self._pending
+        with self._db:
+            for kind, (table, record_type) in self._TABLES.items():
+                records = self._records(kind)
+                if pending is None:
+                    self._db.execute(f"DELETE FROM {table}")
+                    upserts, deletes = records.values(), []
+                else:
+                    ids = [record_id for k, record_id in pending if k == kind]
+                    upserts = [records[i] for i in ids if i in records]
+                    deletes = [(i,) for i in ids if i not in records]
+                names = [field.name for field in fields(record_type)]
+                self._db.executemany(f"DELETE FROM {table} WHERE id = ?", deletes)
+                self._db.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) "
+                    f"VALUES ({', '.join('?' * len(names))})",
+                    ([getattr(record, name) for name in names] for record in upserts)
+                )
+        self._pending = set()
+    
+    def _invalidate(self, kind: str, *keys: Any) -> None:
+        """
+        Drop cached indexes over one kind of record.
+        
+        Args:
+            kind: 'pos' or 'general'
+            *keys: Index keys to drop; all indexes of the kind if omitted
+        """
+        indexes = self._indexes[kind]
+        if not keys:
+            indexes.clear()
+        for key in keys:
+            indexes.pop(key, None)
+    
+    def _index(self, kind: str, key: Any, build: Callable[[], Any]) -> Any:
+        """Return a cached index, building it on first use after invalidation."""
+        indexes = self._indexes[kind]
+        if key not in indexes:
+            indexes[key] = build()
+        return indexes[key]
+    
+    def _records(self, kind: str) -> Dict[str, Any]:
+        """The record dict for 'pos' or 'general'."""
+        return self.pos_products if kind == 'pos' else self.general_items
+    
+    def _record_added(self, kind: str, record_id: str, record: Any) -> None:
+        """Extend cached indexes with a record appended to the end of its dict."""
+        indexes = self._indexes[kind]
+        if 'category' in indexes:
+            seen, by_category = indexes['category']
+            seen[record_id] = (record, record.category)
+            by_category.setdefault(record.category.lower(), []).append(record_id)
+    
+    def _record_updated(self, kind: str, record_id: str, record: Any, keys: Set[str]) -> None:
+        """
+        Refresh cached indexes after some fields of one record changed.
+        
+        Args:
+            kind: 'pos' or 'general'
+            record_id: Id of the changed record
+            record: The changed record
+            keys: Names of the fields that changed
+        """
+        indexes = self._indexes[kind]
+        if 'id' in keys:
+            indexes.clear()
+            return
+        if 'category' in keys:
+            self._invalidate(kind, 'category')
+    
+    @staticmethod
+    def _group_by_category(records: Dict[str, Any]) -> tuple:
+        """
+        Map lowercased category -> record ids, in record order.
+        
+        Returns:
+            (seen, by_category): seen maps each record id to the (record,
+            category) it was grouped by, for _category_index to check
+        """
+        seen: Dict[str, tuple] = {}
+        by_category: Dict[str, List[str]] = {}
+        for record_id, record in records.items():
+            seen[record_id] = (record, record.category)
+            by_category.setdefault(record.category.lower(), []).append(record_id)
+        return seen, by_category
+    
+    def _category_index(self, kind: str) -> Dict[str, List[str]]:
+        """
+        The lowercased category -> record ids index of one kind of record.
+        
+        Records are handed out by get_pos_product / get_general_item and may
+        be changed directly, so the cached index is checked against every
+        record's current category (and the record dict's current members)
+        and rebuilt if any differ.
+        """
+        records = self._records(kind)
+        indexes = self._indexes[kind]
+        if 'category' in indexes:
+            seen = indexes['category'][0]
+            if len(seen) != len(records):
+                del indexes['category']
+            else:
+                for record_id, record in records.items():
+                    entry = seen.get(record_id)
+                    if entry is None or entry[0] is not record or entry[1] is not record.category:
+                        del indexes['category']
+                        break
+        return self._index(kind, 'category', lambda: self._group_by_category(records))[1]
+    
+    def _columns(self, kind: str) -> Dict[str, Any]:
+        """
+        Struct-of-arrays view of one kind of record, rebuilt on every call.
+        
+        The records are handed out by get_pos_product / get_general_item and
+        may be changed directly, so the view is not cached between queries.
+        
+        Args:
+            kind: 'pos' or 'general'
+            
+        Returns:
+            Dict with 'records' (in row order), the numeric columns as float64
+            NumPy arrays (so non-integer counts are not truncated) and
+            'n_categories' (distinct categories)
+        """
+        if kind == 'pos':
+            records = self.pos_products
+            columns = {
+                'price': np.fromiter((p.price for p in records.values()), dtype=np.float64, count=len(records)),
+                'stock': np.fromiter((p.stock for p in records.values()), dtype=np.float64, count=len(records))
+            }
+        else:
+            records = self.general_items
+            columns = {
+                'quantity': np.fromiter((i.quantity for i in records.values()), dtype=np.float64, count=len(records)),
+                'min_quantity': np.fromiter((i.min_quantity for i in records.values()), dtype=np.float64, count=len(records))
+            }
+        columns['records'] = list(records.values())
+        columns['n_categories'] = len({record.category for record in records.values()})
+        return columns
+    
+    def _search(self, kind: str, query: str, field: str) -> List[Any]:
+        """
+        Records of one kind whose field contains query (case-insensitive).
+        
+        Lowercased values are cached per record id with the record and raw
+        value they came from, and relowered when either is no longer current
+        (records may be changed directly, not only through the update methods).
+        """
+        query = query.lower()
+        lowered = self._index(kind, ('field', field), dict)
+        results = []
+        for record_id, record in self._records(kind).items():
+            if not hasattr(record, field):
+                continue
+            value = getattr(record, field, "")
+            entry = lowered.get(record_id)
+            if entry is None or entry[0] is not record or entry[1] is not value:
+                entry = lowered[record_id] = (record, value, value.lower())
+            if query in entry[2]:
+                results.append(record)
+        return results
+    
     def load_data(self) -> None:
         """Load inventory data from the JSON file."""
+        self._invalidate('pos')
+        self._invalidate('general')
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Load POS products
-                pos_data = data.get('pos_products', {})
-                for product_id, product_data in pos_data.items():
-                    self.pos_products[product_id] = POSProduct(**product_data)
-                
-                # Load general items
-                general_data = data.get('general_items', {})
-                for item_id, item_data in general_data.items():
-                    self.general_items[item_id] = GeneralItem(**item_data)
+            if self._db is not None:
+                for kind, (table, record_type) in self._TABLES.items():
+                    names = [field.name for field in fields(record_type)]
+                    records = self._records(kind)
+                    for row in self._db.execute(f"SELECT {', '.join(names)} FROM {table}"):
+                        records[row[0]] = record_type(*row)
+            elif os.path.exists(self.data_file):
+                with open(self.data_file, 'rb') as f:
+                    pos_products, general_items = _decode_inventory(f)
+                self.pos_products.update(pos_products)
+                self.general_items.update(general_items)
                     
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (json.JSONDecodeError, KeyError, TypeError, sqlite3.DatabaseError) as e:
             print(f"Error loading inventory data: {e}")
             # Initialize with empty data if file is corrupted
             self.pos_products = {}
             self.general_items = {}
     
     def save_data(self) -> bool:
-        """Save inventory data to the JSON file."""
+        """Save inventory data to the JSON file (or the changed rows to SQLite)."""
         try:
+            if self._db is not None:
+                self._save_rows()
+                self._dirty = False
+                return True
+            
             data = {
-                'pos_products': {pid: asdict(product) for pid, product in self.pos_products.items()},
-                'general_items': {iid: asdict(item) for iid, item in self.general_items.items()},
+                'pos_products': self.pos_products,
+                'general_items': self.general_items,
                 'last_updated': datetime.now().isoformat(),
                 'version': '1.0'
             }
             
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            buf = _dumps(data)
+            # "last_updated" is the first key after the records (escaped quotes
+            # mean it cannot match inside a value); skip rewriting unchanged data
+            records = buf[:buf.rfind(b'"last_updated"')]
+            if records != self._saved_records or self._file_stat() != self._saved_stat:
+                with atomic_write(self.data_file, 'wb') as f:
+                    f.write(buf)
+                self._saved_records = records
+                self._saved_stat = self._file_stat()
+            self._dirty = False
             return True
             
         except Exception as e:
             print(f"Error saving inventory data: {e}")
             return False
     
+    def _file_stat(self) -> Optional[tuple]:
+        """(size, mtime_ns) of the data file, or None if it does not exist."""
+        try:
+            st = os.stat(self.data_file)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+    
+    # Record constructors for the add_* hot paths: every field is known, so
+    # allocate and fill the slots directly instead of running the dataclass
+    # __init__ and __post_init__ (POSProduct(...) is unchanged for callers)
+    @staticmethod
+    def _make_pos(product_id: str, name: str, price: float, stock: int,
+                  category: str, description: str, now: str) -> POSProduct:
+        """Build a POSProduct stamped with `now`."""
+        product = POSProduct.__new__(POSProduct)
+        product.id = product_id
+        product.name = name
+        product.price = price
+        product.stock = stock
+        product.category = category
+        product.description = description
+        product.created_at = now
+        product.updated_at = now
+        return product
+    
+    @staticmethod
+    def _make_general(item_id: str, name: str, quantity: int, category: str, description: str,
+                      unit: str, min_quantity: int, location: str, now: str) -> GeneralItem:
+        """Build a GeneralItem stamped with `now`."""
+        item = GeneralItem.__new__(GeneralItem)
+        item.id = item_id
+        item.name = name
+        item.quantity = quantity
+        item.category = category
+        item.description = description
+        item.unit = unit
+        item.min_quantity = min_quantity
+        item.location = location
+        item.created_at = now
+        item.updated_at = now
+        return item
+    
     # POS Product Methods
     def add_pos_product(self, name: str, price: float, stock: int, 
                        category: str = "General", description: str = "") -> str:
@@ -141,17 +618,12 @@ class InventoryManager:
         Returns:
             Product ID
         """
-        product_id = f"prod_{uuid.uuid4().hex[:8]}"
-        product = POSProduct(
-            id=product_id,
-            name=name,
-            price=price,
-            stock=stock,
-            category=category,
-            description=description
-        )
+        product_id = self._new_id('prod', self.pos_products)
+        now = self._now_iso()
+        product = self._make_pos(product_id, name, price, stock, category, description, now)
         self.pos_products[product_id] = product
-        self.save_data()
+        self._record_added('pos', product_id, product)
+        self._mark_dirty('pos', product_id)
         return product_id
     
     def update_pos_product(self, product_id: str, **kwargs) -> bool:
@@ -165,16 +637,17 @@ class InventoryManager:
         Returns:
             True if successful, False otherwise
         """
-        if product_id not in self.pos_products:
+        product = self.pos_products.get(product_id)
+        if product is None:
             return False
         
-        product = self.pos_products[product_id]
-        for key, value in kwargs.items():
-            if hasattr(product, key):
-                setattr(product, key, value)
+        changed = kwargs.keys() & POSProduct._FIELDS
+        for key in changed:
+            setattr(product, key, kwargs[key])
         
-        product.updated_at = datetime.now().isoformat()
-        self.save_data()
+        product.updated_at = self._now_iso()
+        self._record_updated('pos', product_id, product, changed | {'updated_at'})
+        self._mark_dirty('pos', product_id)
         return True
     
     def get_pos_product(self, product_id: str) -> Optional[POSProduct]:
@@ -187,9 +660,9 @@ class InventoryManager:
     
     def delete_pos_product(self, product_id: str) -> bool:
         """Delete a POS product."""
-        if product_id in self.pos_products:
-            del self.pos_products[product_id]
-            self.save_data()
+        if self.pos_products.pop(product_id, None) is not None:
+            self._invalidate('pos')
+            self._mark_dirty('pos', product_id)
             return True
         return False
     
@@ -204,17 +677,18 @@ class InventoryManager:
         Returns:
             True if successful, False otherwise
         """
-        if product_id not in self.pos_products:
+        product = self.pos_products.get(product_id)
+        if product is None:
             return False
         
-        product = self.pos_products[product_id]
         new_stock = product.stock + quantity_change
         if new_stock < 0:
             return False
         
         product.stock = new_stock
-        product.updated_at = datetime.now().isoformat()
-        self.save_data()
+        product.updated_at = self._now_iso()
+        self._record_updated('pos', product_id, product, {'stock', 'updated_at'})
+        self._mark_dirty('pos', product_id)
         return True
     
     # General Item Methods
@@ -236,19 +710,13 @@ class InventoryManager:
         Returns:
             Item ID
         """
-        item_id = f"item_{uuid.uuid4().hex[:8]}"
-        item = GeneralItem(
-            id=item_id,
-            name=name,
-            quantity=quantity,
-            category=category,
-            description=description,
-            unit=unit,
-            min_quantity=min_quantity,
-            location=location
-        )
+        item_id = self._new_id('item', self.general_items)
+        now = self._now_iso()
+        item = self._make_general(item_id, name, quantity, category, description,
+                                  unit, min_quantity, location, now)
         self.general_items[item_id] = item
-        self.save_data()
+        self._record_added('general', item_id, item)
+        self._mark_dirty('general', item_id)
         return item_id
     
     def update_general_item(self, item_id: str, **kwargs) -> bool:
@@ -262,16 +730,17 @@ class InventoryManager:
         Returns:
             True if successful, False otherwise
         """
-        if item_id not in self.general_items:
+        item = self.general_items.get(item_id)
+        if item is None:
             return False
         
-        item = self.general_items[item_id]
-        for key, value in kwargs.items():
-            if hasattr(item, key):
-                setattr(item, key, value)
+        changed = kwargs.keys() & GeneralItem._FIELDS
+        for key in changed:
+            setattr(item, key, kwargs[key])
         
-        item.updated_at = datetime.now().isoformat()
-        self.save_data()
+        item.updated_at = self._now_iso()
+        self._record_updated('general', item_id, item, changed | {'updated_at'})
+        self._mark_dirty('general', item_id)
         return True
     
     def get_general_item(self, item_id: str) -> Optional[GeneralItem]:
@@ -284,9 +753,9 @@ class InventoryManager:
     
     def delete_general_item(self, item_id: str) -> bool:
         """Delete a general inventory item."""
-        if item_id in self.general_items:
-            del self.general_items[item_id]
-            self.save_data()
+        if self.general_items.pop(item_id, None) is not None:
+            self._invalidate('general')
+            self._mark_dirty('general', item_id)
             return True
         return False
     
@@ -301,17 +770,18 @@ class InventoryManager:
         Returns:
             True if successful, False otherwise
         """
-        if item_id not in self.general_items:
+        item = self.general_items.get(item_id)
+        if item is None:
             return False
         
-        item = self.general_items[item_id]
         new_quantity = item.quantity + quantity_change
         if new_quantity < 0:
             return False
         
         item.quantity = new_quantity
-        item.updated_at = datetime.now().isoformat()
-        self.save_data()
+        item.updated_at = self._now_iso()
+        self._record_updated('general', item_id, item, {'quantity', 'updated_at'})
+        self._mark_dirty('general', item_id)
         return True
     
     # Search and Filter Methods
@@ -326,16 +796,7 @@ class InventoryManager:
         Returns:
             List of matching products
         """
-        query = query.lower()
-        results = []
-        
-        for product in self.pos_products.values():
-            if hasattr(product, field):
-                field_value = getattr(product, field, "").lower()
-                if query in field_value:
-                    results.append(product)
-        
-        return results
+        return self._search('pos', query, field)
     
     def search_general_items(self, query: str, field: str = "name") -> List[GeneralItem]:
         """
@@ -348,16 +809,7 @@ class InventoryManager:
         Returns:
             List of matching items
         """
-        query = query.lower()
-        results = []
-        
-        for item in self.general_items.values():
-            if hasattr(item, field):
-                field_value = getattr(item, field, "").lower()
-                if query in field_value:
-                    results.append(item)
-        
-        return results
+        return self._search('general', query, field)
     
     def filter_by_category(self, category: str, inventory_type: InventoryType) -> List[Union[POSProduct, GeneralItem]]:
         """
@@ -370,10 +822,9 @@ class InventoryManager:
         Returns:
             List of items in the specified category
         """
-        if inventory_type == InventoryType.POS_PRODUCT:
-            return [p for p in self.pos_products.values() if p.category.lower() == category.lower()]
-        else:
-            return [i for i in self.general_items.values() if i.category.lower() == category.lower()]
+        kind = 'pos' if inventory_type == InventoryType.POS_PRODUCT else 'general'
+        records = self._records(kind)
+        return [records[record_id] for record_id in self._category_index(kind).get(category.lower(), ())]
     
     def get_low_stock_items(self, threshold: int = 5) -> Dict[str, List]:
         """
@@ -385,8 +836,15 @@ class InventoryManager:
         Returns:
             Dictionary with low stock POS products and general items
         """
-        low_stock_pos = [p for p in self.pos_products.values() if p.stock <= threshold]
-        low_stock_general = [i for i in self.general_items.values() if i.quantity <= i.min_quantity]
+        return self._low_stock(self._columns('pos'), self._columns('general'), threshold)
+    
+    @staticmethod
+    def _low_stock(pos: Dict[str, Any], general: Dict[str, Any], threshold: int) -> Dict[str, List]:
+        """get_low_stock_items over already built _columns() views."""
+        low_pos_rows = np.flatnonzero(pos['stock'] <= threshold).tolist()
+        low_general_rows = np.flatnonzero(general['quantity'] <= general['min_quantity']).tolist()
+        low_stock_pos = [pos['records'][row] for row in low_pos_rows]
+        low_stock_general = [general['records'][row] for row in low_general_rows]
         
         return {
             'pos_products': low_stock_pos,
@@ -398,14 +856,14 @@ class InventoryManager:
         """Export all inventory data to a JSON file."""
         try:
             data = {
-                'pos_products': {pid: asdict(product) for pid, product in self.pos_products.items()},
-                'general_items': {iid: asdict(item) for iid, item in self.general_items.items()},
+                'pos_products': self.pos_products,
+                'general_items': self.general_items,
                 'export_date': datetime.now().isoformat(),
                 'version': '1.0'
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            with open(filepath, 'wb') as f:
+                f.write(_dumps(data))
             return True
             
         except Exception as e:
@@ -424,44 +882,85 @@ class InventoryManager:
             True if successful, False otherwise
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                loaded = self._import_parallel(f, filepath)
+                if loaded is not None:
+                    pos_products, general_items = loaded
+                elif ijson is not None:
+                    # Stream one record at a time rather than materializing
+                    # the whole file as a dict tree first
+                    pos_data = ijson.kvitems(f, 'pos_products', use_float=True)
+                    pos_products = {pid: POSProduct(**fields) for pid, fields in pos_data}
+                    f.seek(0)
+                    general_data = ijson.kvitems(f, 'general_items', use_float=True)
+                    general_items = {iid: GeneralItem(**fields) for iid, fields in general_data}
+                else:
+                    data = load_json_file(f)
+                    pos_products = {pid: POSProduct(**fields)
+                                    for pid, fields in data.get('pos_products', {}).items()}
+                    general_items = {iid: GeneralItem(**fields)
+                                     for iid, fields in data.get('general_items', {}).items()}
             
+            # Only touch the inventory once the whole file has been read
             if not merge:
                 self.pos_products.clear()
                 self.general_items.clear()
+            self.pos_products.update(pos_products)
+            self.general_items.update(general_items)
+            self._invalidate('pos')
+            self._invalidate('general')
             
-            # Import POS products
-            pos_data = data.get('pos_products', {})
-            for product_id, product_data in pos_data.items():
-                self.pos_products[product_id] = POSProduct(**product_data)
-            
-            # Import general items
-            general_data = data.get('general_items', {})
-            for item_id, item_data in general_data.items():
-                self.general_items[item_id] = GeneralItem(**item_data)
-            
-            self.save_data()
+            self._mark_dirty()
             return True
             
         except Exception as e:
             print(f"Error importing data: {e}")
             return False
     
+    @staticmethod
+    def _import_parallel(f: IO[bytes], filepath: str) -> Optional[tuple]:
+        """
+        Parse a large indented inventory file across worker processes.
+        
+        Args:
+            f: The open file
+            filepath: Path to the file, reopened by each worker
+            
+        Returns:
+            (pos_products, general_items) dicts, or None if the file is small
+            or not in the layout written by export_to_json
+        """
+        if os.fstat(f.fileno()).st_size < _PARALLEL_IMPORT_BYTES:
+            return None
+        workers = os.cpu_count() or 1
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            spans = _shard_spans(mm, workers)
+        if spans is None:
+            return None
+        
+        results = {section: {} for section in spans}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(section, pool.submit(_parse_shard, filepath, section, start, end))
+                       for section, parts in spans.items() for start, end in parts]
+            # Merge in file order so a repeated id keeps its last value
+            for section, future in futures:
+                results[section].update(future.result())
+        return results['pos_products'], results['general_items']
+    
     # Statistics and Reports
     def get_inventory_stats(self) -> Dict[str, Any]:
         """Get comprehensive inventory statistics."""
         total_pos_products = len(self.pos_products)
         total_general_items = len(self.general_items)
         
-        total_pos_value = sum(p.price * p.stock for p in self.pos_products.values())
-        total_pos_stock = sum(p.stock for p in self.pos_products.values())
-        total_general_quantity = sum(i.quantity for i in self.general_items.values())
-        
-        pos_categories = set(p.category for p in self.pos_products.values())
-        general_categories = set(i.category for i in self.general_items.values())
+        pos = self._columns('pos')
+        general = self._columns('general')
+        total_pos_value = float(pos['price'] @ pos['stock'])
+        # Summed from the records so the totals keep their exact values and type
+        total_pos_stock = sum(p.stock for p in pos['records'])
+        total_general_quantity = sum(i.quantity for i in general['records'])
         
-        low_stock = self.get_low_stock_items()
+        low_stock = self._low_stock(pos, general, 5)
         
         return {
             'total_pos_products': total_pos_products,
@@ -469,13 +968,41 @@ class InventoryManager:
             'total_pos_value': total_pos_value,
             'total_pos_stock': total_pos_stock,
             'total_general_quantity': total_general_quantity,
-            'pos_categories': len(pos_categories),
-            'general_categories': len(general_categories),
+            'pos_categories': pos['n_categories'],
+            'general_categories': general['n_categories'],
             'low_stock_pos': len(low_stock['pos_products']),
             'low_stock_general': len(low_stock['general_items']),
             'last_updated': datetime.now().isoformat()
         }
     
+    @staticmethod
+    def _parse_old_pos_file(pos_file: str) -> List[tuple]:
+        """
+        Parse an old pipe-delimited POS file (id|name|price|stock per line).
+        
+        Args:
+            pos_file: Path to old POS products file
+            
+        Returns:
+            (name, price, stock) tuples; lines with fewer than four fields or
+            a non-numeric price/stock are skipped
+        """
+        with open(pos_file, 'r', encoding='utf-8') as f:
+            text = f.read()
+        # One split for the whole file; vectorised strip/split per line.
+        # Short lines leave None in the trailing columns.
+        fields = pd.Series(text.split('\n'), dtype=object).str.strip().str.split('|', expand=True)
+        if fields.shape[1] < 4:
+            return []
+        fields = fields[fields[3].notna()]
+        rows = []
+        for name, price, stock in zip(fields[1].tolist(), fields[2].tolist(), fields[3].tolist()):
+            try:
+                rows.append((name, float(price), int(stock)))
+            except (ValueError, TypeError):
+                continue
+        return rows
+    
     def migrate_from_old_format(self, pos_file: str, general_file: str) -> bool:
         """
         Migrate data from old format files to the unified format.
@@ -488,38 +1015,31 @@ class InventoryManager:
             True if successful, False otherwise
         """
         try:
-            # Migrate POS products from pipe-delimited format
-            if os.path.exists(pos_file):
-                with open(pos_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and '|' in line:
-                            parts = line.split('|')
-                            if len(parts) >= 4:
-                                product_id, name, price, stock = parts[:4]
-                                try:
-                                    self.add_pos_product(
-                                        name=name,
-                                        price=float(price),
-                                        stock=int(stock),
-                                        category="General"
-                                    )
-                                except (ValueError, TypeError):
-                                    continue
+            # One save for the whole migration rather than one per row
+            with self:
+                # Migrate POS products from pipe-delimited format
+                if os.path.exists(pos_file):
+                    for name, price, stock in self._parse_old_pos_file(pos_file):
+                        self.add_pos_product(
+                            name=name,
+                            price=price,
+                            stock=stock,
+                            category="General"
+                        )
             
-            # Migrate general items from JSON format
-            if os.path.exists(general_file):
-                with open(general_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for item_data in data:
-                        try:
-                            self.add_general_item(
-                                name=item_data['name'],
-                                quantity=item_data['quantity'],
-                                category=item_data['category']
-                            )
-                        except (KeyError, TypeError):
-                            continue
+                # Migrate general items from JSON format
+                if os.path.exists(general_file):
+                    with open(general_file, 'rb') as f:
+                        data = ijson.items(f, 'item', use_float=True) if ijson is not None else loads_json(f.read())
+                        for item_data in data:
+                            try:
+                                self.add_general_item(
+                                    name=item_data['name'],
+                                    quantity=item_data['quantity'],
+                                    category=item_data['category']
+                                )
+                            except (KeyError, TypeError):
+                                continue
             
             return True
             
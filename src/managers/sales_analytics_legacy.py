@@ -15,11 +15,13 @@ Features:
 """
 
 import json
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from collections import defaultdict, Counter
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Union
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.figure import Figure
@@ -28,14 +30,21 @@ import seaborn as sns
 import tkinter as tk
 from tkinter import ttk, messagebox
 import calendar
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, MISSING
 from pathlib import Path
+from src.models import DAY_MICROS, to_micros
+from src.utils.io_utils import atomic_write, dumps_json, loads_json
+
+try:
+    from numba import njit
+except ImportError:  # _group_totals runs as NumPy bincounts instead
+    njit = None
 
 # Set style for better-looking charts
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
-@dataclass
+@dataclass(slots=True)
 class SalesRecord:
     """Data structure for sales records."""
     id: str
@@ -50,6 +59,299 @@ class SalesRecord:
     customer_id: str = ""
     salesperson_id: str = ""
 
+def _record_dict(record: SalesRecord) -> Dict[str, Any]:
+    """Storage form of a sales record (timestamp as an ISO string)."""
+    return {
+        'id': record.id,
+        'timestamp': record.timestamp.isoformat(),
+        'items': record.items,
+        'subtotal': record.subtotal,
+        'tax': record.tax,
+        'total': record.total,
+        'tendered': record.tendered,
+        'change': record.change,
+        'payment_method': record.payment_method,
+        'customer_id': record.customer_id,
+        'salesperson_id': record.salesperson_id
+    }
+
+def _group_totals(codes: np.ndarray, qty: np.ndarray, price: np.ndarray, n_groups: int):
+    """Per-group revenue (sum of qty * price), quantity total and line-item count."""
+    revenue = np.bincount(codes, weights=qty * price, minlength=n_groups).astype(np.float64)
+    quantity = np.bincount(codes, weights=qty, minlength=n_groups).astype(np.float64)
+    lines = np.bincount(codes, minlength=n_groups)
+    return revenue, quantity, lines
+
+def _group_totals_loop(codes: np.ndarray, qty: np.ndarray, price: np.ndarray, n_groups: int):
+    """Single-pass form of _group_totals for numba to compile."""
+    revenue = np.zeros(n_groups)
+    quantity = np.zeros(n_groups)
+    lines = np.zeros(n_groups, dtype=np.int64)
+    for i in range(codes.size):
+        group = codes[i]
+        revenue[group] += qty[i] * price[i]
+        quantity[group] += qty[i]
+        lines[group] += 1
+    return revenue, quantity, lines
+
+if njit is not None:
+    # Serial on purpose: a prange scatter-add into shared groups would race
+    _group_totals = njit(cache=True)(_group_totals_loop)
+
+# Keys a stored sale must / may have to build a SalesRecord
+_RECORD_FIELDS = frozenset(field.name for field in fields(SalesRecord))
+_REQUIRED_FIELDS = frozenset(field.name for field in fields(SalesRecord) if field.default is MISSING)
+
+def _parse_timestamps(values: List[str]) -> np.ndarray:
+    """Parse ISO-format timestamp strings into epoch microseconds in one vectorised call."""
+    try:
+        return np.array(values, dtype='datetime64[us]').astype(np.int64)
+    except ValueError:  # a variant only datetime.fromisoformat understands
+        return np.array([to_micros(datetime.fromisoformat(value)) for value in values],
+                        dtype=np.int64)
+
+class _SalesColumns:
+    """
+    Columnar (SoA) mirror of SalesAnalytics.sales_records.
+    
+    Each column is a NumPy array grown by amortized doubling; only the first
+    `size` entries are valid, in the same order as the records. Timestamps
+    are stored as microseconds since the (naive) epoch, so date-range filters
+    compare plain integers; 'day' (days since the epoch) and 'hour' (hour of
+    day) are derived from them once, when the sale is added.
+    
+    Per sale, 'items' holds the total quantity of its line items and
+    'items_float' whether any of those quantities was a float.
+    
+    Line items are flattened into a second table (`n_items` rows) holding
+    the index of their sale, integer codes for the product name and
+    category, and the quantity and unit price.
+    """
+    _DTYPES = {'ts': np.int64, 'day': np.int64, 'hour': np.int8, 'subtotal': np.float64, 'tax': np.float64,
+               'total': np.float64, 'items': np.float64, 'items_float': np.bool_}
+    _ITEM_DTYPES = {'sale': np.int64, 'name': np.int64, 'category_name': np.int64, 'category': np.int64,
+                    'qty': np.float64, 'qty_float': np.bool_, 'price': np.float64}
+    # Placeholder for a missing item name during bulk loads
+    _UNNAMED = object()
+    HOUR = 3_600_000_000
+    
+    def __init__(self):
+        self.size = 0
+        self.n_items = 0
+        # Whether 'ts' is non-decreasing (sales recorded as they happen);
+        # otherwise rows() searches a lazily built sorted permutation
+        self.ordered = True
+        self._order: Optional[np.ndarray] = None
+        self._sorted_ts: Optional[np.ndarray] = None
+        self._arrays = {name: np.empty(64, dtype=dtype) for name, dtype in self._DTYPES.items()}
+        self._items = {name: np.empty(256, dtype=dtype) for name, dtype in self._ITEM_DTYPES.items()}
+        # Item names and categories as integer codes, and the code -> value lookups
+        self.codes: Dict[Any, int] = {}
+        self.values: List[Any] = []
+    
+    @staticmethod
+    def _reserve(arrays: Dict[str, np.ndarray], size: int, count: int = 1) -> None:
+        """Grow every array in `arrays` (by doubling) to fit `count` rows past `size`."""
+        capacity = len(next(iter(arrays.values())))
+        if size + count > capacity:
+            while size + count > capacity:
+                capacity *= 2
+            for name, array in arrays.items():
+                grown = np.empty(capacity, dtype=array.dtype)
+                grown[:size] = array[:size]
+                arrays[name] = grown
+    
+    def code(self, value: Any) -> int:
+        """Integer code of an item name or category, assigning a new one if needed."""
+        code = self.codes.setdefault(value, len(self.codes))
+        if code == len(self.values):
+            self.values.append(value)
+        return code
+    
+    def append(self, record: SalesRecord) -> None:
+        """Append one sales record and its line items."""
+        self._reserve(self._arrays, self.size)
+        ts = to_micros(record.timestamp)
+        if self.size and ts < self._arrays['ts'][self.size - 1]:
+            self.ordered = False
+        self._arrays['ts'][self.size] = ts
+        self._arrays['day'][self.size] = ts // DAY_MICROS
+        self._arrays['hour'][self.size] = ts // self.HOUR % 24
+        self._arrays['subtotal'][self.size] = record.subtotal
+        self._arrays['tax'][self.size] = record.tax
+        self._arrays['total'][self.size] = record.total
+        self._append_items(record.items)
+        self.size += 1
+    
+    def extend(self, sales: List[Dict[str, Any]], timestamps: np.ndarray) -> None:
+        """
+        Append stored sales in bulk, without building SalesRecord objects.
+        
+        Args:
+            sales: Sale dicts as stored in the history file
+            timestamps: Their timestamps as epoch microseconds
+        """
+        count = len(sales)
+        self._reserve(self._arrays, self.size, count)
+        end = self.size + count
+        self._arrays['ts'][self.size:end] = timestamps
+        self._arrays['day'][self.size:end] = timestamps // DAY_MICROS
+        self._arrays['hour'][self.size:end] = timestamps // self.HOUR % 24
+        if count and (np.any(np.diff(timestamps) < 0)
+                      or (self.size and timestamps[0] < self._arrays['ts'][self.size - 1])):
+            self.ordered = False
+        for name in ('subtotal', 'tax', 'total'):
+            self._arrays[name][self.size:end] = np.fromiter((sale[name] for sale in sales),
+                                                            dtype=np.float64, count=count)
+        
+        # Line items of every sale as one flat table, a column at a time
+        flat = [item for sale in sales for item in sale['items']]
+        n_items = len(flat)
+        sale_index = np.repeat(np.arange(count), [len(sale['items']) for sale in sales])
+        quantities = [item.get('quantity', 0) for item in flat]
+        qty = np.array(quantities, dtype=np.float64)
+        qty_float = np.fromiter((isinstance(quantity, float) for quantity in quantities),
+                                dtype=np.bool_, count=n_items)
+        name_groups, names = self._factorize([item.get('name', self._UNNAMED) for item in flat])
+        category_groups, categories = self._factorize([item.get('category', 'Uncategorized') for item in flat])
+        columns = {
+            'sale': sale_index + self.size,
+            # Unnamed items: 'Unknown Product' by product, 'Unknown' within a category
+            'name': self._lookup(names, 'Unknown Product')[name_groups],
+            'category_name': self._lookup(names, 'Unknown')[name_groups],
+            'category': self._lookup(categories)[category_groups],
+            'qty': qty,
+            'qty_float': qty_float,
+            'price': np.fromiter((item.get('price', 0.0) for item in flat), dtype=np.float64, count=n_items)
+        }
+        self._reserve(self._items, self.n_items, n_items)
+        for name, column in columns.items():
+            self._items[name][self.n_items:self.n_items + n_items] = column
+        self.n_items += n_items
+        
+        self._arrays['items'][self.size:end] = np.bincount(sale_index, weights=qty, minlength=count)
+        self._arrays['items_float'][self.size:end] = np.bincount(sale_index, weights=qty_float, minlength=count) > 0
+        self.size = end
+    
+    @staticmethod
+    def _factorize(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Group numbers of `values` and the distinct values, in first-seen order."""
+        # (the extra None keeps NumPy from turning tuple values into a 2-D array)
+        return pd.factorize(np.array(values + [None], dtype=object)[:-1], use_na_sentinel=False)
+    
+    def _lookup(self, uniques: np.ndarray, unnamed: Any = None) -> np.ndarray:
+        """Codes (see code()) of factorized values, with _UNNAMED standing for `unnamed`."""
+        return np.fromiter((self.code(unnamed if value is self._UNNAMED else value) for value in uniques),
+                           dtype=np.int64, count=len(uniques))
+    
+    def _append_items(self, sale_items: List[Dict[str, Any]]) -> None:
+        """Append the line items of the sale at row `size`, and their quantity total."""
+        items = self._items
+        total_quantity = 0
+        for item in sale_items:
+            self._reserve(items, self.n_items)
+            row = self.n_items
+            quantity = item.get('quantity', 0)
+            if 'name' in item:
+                name = category_name = self.code(item['name'])
+            else:
+                # Product performance groups unnamed items as 'Unknown Product',
+                # category performance counts them as a product named 'Unknown'
+                name, category_name = self.code('Unknown Product'), self.code('Unknown')
+            items['sale'][row] = self.size
+            items['name'][row] = name
+            items['category_name'][row] = category_name
+            items['category'][row] = self.code(item.get('category', 'Uncategorized'))
+            items['qty'][row] = quantity
+            items['qty_float'][row] = isinstance(quantity, float)
+            items['price'][row] = item.get('price', 0.0)
+            self.n_items += 1
+            total_quantity += quantity
+        self._arrays['items'][self.size] = total_quantity
+        self._arrays['items_float'][self.size] = isinstance(total_quantity, float)
+    
+    def rows(self, start: int, end: int) -> Union[slice, np.ndarray]:
+        """
+        Rows whose timestamp lies in [start, end], found by binary search.
+        
+        Args:
+            start: Range start in epoch microseconds (inclusive)
+            end: Range end in epoch microseconds (inclusive)
+            
+        Returns:
+            A slice of the columns when the timestamps are in order, otherwise
+            an ascending index array
+        """
+        if self.ordered:
+            ts = self['ts']
+            return slice(int(np.searchsorted(ts, start, 'left')), int(np.searchsorted(ts, end, 'right')))
+        if self._order is None or len(self._order) != self.size:
+            self._order = np.argsort(self['ts'], kind='stable')
+            self._sorted_ts = self['ts'][self._order]
+        lo = np.searchsorted(self._sorted_ts, start, 'left')
+        hi = np.searchsorted(self._sorted_ts, end, 'right')
+        return np.sort(self._order[lo:hi])
+    
+    def item_rows(self, rows: Union[slice, np.ndarray]) -> Union[slice, np.ndarray]:
+        """Line-item rows belonging to the given sale rows (a slice maps to a slice)."""
+        if isinstance(rows, slice):
+            # Items are appended sale by sale, so 'sale' is sorted
+            sales = self['sale']
+            return slice(int(np.searchsorted(sales, rows.start, 'left')),
+                         int(np.searchsorted(sales, rows.stop, 'left')))
+        in_range = np.zeros(self.size, dtype=bool)
+        in_range[rows] = True
+        return np.flatnonzero(in_range[self['sale']])
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self._arrays:
+            return self._arrays[name][:self.size]
+        return self._items[name][:self.n_items]
+
+def _memoized(method):
+    """
+    Cache a date-range query of SalesAnalytics per (start_date, end_date).
+    
+    Entries are dropped whenever the number of sales changes, so a new sale
+    invalidates every cached result. Calls relying on the "now"-relative
+    defaults are not cached, and "now"-relative callers should pass a
+    _recent_window so their keys repeat. Cached results are shared between callers and
+    must not be modified.
+    
+    Queries may run on a SalesDashboard worker thread while the main thread
+    clears the cache, so every access to it holds _cache_lock (the query
+    itself runs outside the lock).
+    """
+    @functools.wraps(method)
+    def wrapper(self, start_date: datetime = None, end_date: datetime = None):
+        if start_date is None or end_date is None:
+            return method(self, start_date, end_date)
+        size = self._sales_columns().size
+        key = (method.__name__, start_date, end_date)
+        with self._cache_lock:
+            if size != self._cache_size or len(self._cache) >= 256:
+                self._cache.clear()
+                self._cache_size = size
+            if key in self._cache:
+                return self._cache[key]
+        result = method(self, start_date, end_date)
+        with self._cache_lock:
+            # Not stored if the sales changed while the query ran
+            if size == self._cache_size:
+                self._cache[key] = result
+        return result
+    return wrapper
+
+def _recent_window(days: int) -> Tuple[datetime, datetime]:
+    """
+    Get the (start_date, end_date) range covering the last `days` days.
+    
+    The end is rounded up to the next whole minute, so repeated refreshes
+    within a minute pass the same range and hit the @_memoized cache.
+    """
+    end_date = datetime.now().replace(second=0, microsecond=0) + timedelta(minutes=1)
+    return end_date - timedelta(days=days), end_date
+
 class SalesAnalytics:
     """
     Comprehensive sales analytics and reporting system.
@@ -64,60 +366,160 @@ class SalesAnalytics:
         """
         self.data_path = Path(data_path)
         self.data_path.mkdir(exist_ok=True)
+        self._columns_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
         self.sales_records: List[SalesRecord] = []
         self.load_sales_data()
     
+    @property
+    def sales_records(self) -> List[SalesRecord]:
+        """All sales; after a load the SalesRecord objects are only built on first access."""
+        if self._records is None:
+            sales, timestamps = self._loaded
+            self._records = [SalesRecord(**{**sale, 'timestamp': timestamp})
+                             for sale, timestamp in zip(sales, timestamps.astype('datetime64[us]').tolist())]
+            self._loaded = None
+        return self._records
+    
+    @sales_records.setter
+    def sales_records(self, records: List[SalesRecord]) -> None:
+        self._records: Optional[List[SalesRecord]] = records
+        # Stored sale dicts and parsed timestamps awaiting SalesRecord construction
+        self._loaded: Optional[Tuple[List[Dict[str, Any]], np.ndarray]] = None
+        # Columnar copy of the sales, caught up lazily by _sales_columns()
+        self._columns = _SalesColumns()
+        # Bumped whenever the sales are replaced rather than appended to
+        self._generation = getattr(self, '_generation', 0) + 1
+        # Results of the @_memoized queries, valid while there are _cache_size sales
+        self._cache: Dict[tuple, Any] = {}
+        self._cache_size = 0
+    
     def load_sales_data(self):
         """Load sales data from storage."""
         try:
-            sales_file = self.data_path / "sales_history.json"
-            if sales_file.exists():
-                with open(sales_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                self.sales_records = []
-                for record_data in data.get('sales', []):
-                    # Convert timestamp string back to datetime
-                    record_data['timestamp'] = datetime.fromisoformat(record_data['timestamp'])
-                    self.sales_records.append(SalesRecord(**record_data))
+            log_file = self.data_path / "sales_history.jsonl"
+            legacy_file = self.data_path / "sales_history.json"
+            if log_file.exists():
+                raw = log_file.read_bytes()
+                lines = raw.splitlines()
+                # A crash mid-append can leave a partial last line: drop it,
+                # and rewrite the log so the next append starts on a new line
+                rewrite = bool(raw) and not raw.endswith(b'\n')
+                if rewrite:
+                    try:
+                        loads_json(lines[-1])
+                    except ValueError:
+                        lines.pop()
+                sales = [loads_json(line) for line in lines if line.strip()]
+            elif legacy_file.exists():
+                # Single-document history from older versions; converted to the log
+                sales = loads_json(legacy_file.read_bytes()).get('sales', [])
+                rewrite = True
+            else:
+                return
+            
+            # Reject bad records now rather than when they are first built
+            for keys in {frozenset(sale) for sale in sales}:
+                if not _REQUIRED_FIELDS <= keys <= _RECORD_FIELDS:
+                    raise TypeError(f"Invalid sales record fields: {sorted(keys)}")
+            timestamps = _parse_timestamps([sale['timestamp'] for sale in sales])
+            
+            # Fill the columns straight from the parsed data
+            columns = _SalesColumns()
+            columns.extend(sales, timestamps)
+            self._records = None
+            self._loaded = (sales, timestamps)
+            self._columns = columns
+            with self._cache_lock:
+                self._cache.clear()
+            self._generation += 1
+            if rewrite:
+                self._write_log(sales)
         except Exception as e:
             print(f"Error loading sales data: {e}")
             self.sales_records = []
     
+    def _write_log(self, sales: Iterable[Dict[str, Any]]) -> None:
+        """Atomically rewrite the sales log with one JSON line per sale."""
+        with atomic_write(self.data_path / "sales_history.jsonl", 'wb') as f:
+            f.write(b''.join(dumps_json(sale) + b'\n' for sale in sales))
+    
     def save_sales_data(self):
-        """Save sales data to storage."""
+        """Rewrite (compact) the whole sales log from sales_records."""
         try:
-            sales_file = self.data_path / "sales_history.json"
-            data = {
-                'sales': [
-                    {
-                        'id': record.id,
-                        'timestamp': record.timestamp.isoformat(),
-                        'items': record.items,
-                        'subtotal': record.subtotal,
-                        'tax': record.tax,
-                        'total': record.total,
-                        'tendered': record.tendered,
-                        'change': record.change,
-                        'payment_method': record.payment_method,
-                        'customer_id': record.customer_id,
-                        'salesperson_id': record.salesperson_id
-                    }
-                    for record in self.sales_records
-                ],
-                'last_updated': datetime.now().isoformat()
-            }
-            
-            with open(sales_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            self._write_log(_record_dict(record) for record in self.sales_records)
         except Exception as e:
             print(f"Error saving sales data: {e}")
     
     def add_sale(self, sale_record: SalesRecord):
-        """Add a new sale record."""
+        """Add a new sale record, appending it to the sales log."""
         self.sales_records.append(sale_record)
-        self.save_sales_data()
+        try:
+            with open(self.data_path / "sales_history.jsonl", 'ab') as f:
+                f.write(dumps_json(_record_dict(sale_record)) + b'\n')
+        except Exception as e:
+            print(f"Error saving sales data: {e}")
+    
+    @property
+    def data_version(self) -> Tuple[int, int]:
+        """Changes whenever the sales data does (a sale is added or the sales are replaced)."""
+        return self._generation, self._sales_columns().size
+    
+    def _sales_columns(self) -> _SalesColumns:
+        """Return the columnar sales data, appending any records added since the last call."""
+        if self._records is None:  # loaded in bulk and not modified since
+            return self._columns
+        # Queries may run on a worker thread (SalesDashboard); only one may catch up
+        with self._columns_lock:
+            cols = self._columns
+            if cols.size > len(self.sales_records):  # the list was replaced or shrunk
+                cols = self._columns = _SalesColumns()
+                with self._cache_lock:
+                    self._cache.clear()
+            for record in self.sales_records[cols.size:]:
+                cols.append(record)
+            return cols
+    
+    def _sale_rows(self, start_date: datetime, end_date: datetime) -> Union[slice, np.ndarray]:
+        """Rows of the sales with start_date <= timestamp <= end_date (see _SalesColumns.rows)."""
+        return self._sales_columns().rows(to_micros(start_date), to_micros(end_date))
+    
+    def _item_rows(self, start_date: datetime, end_date: datetime) -> Union[slice, np.ndarray]:
+        """Rows of the line items of the sales in a date range, in the order they were sold."""
+        return self._sales_columns().item_rows(self._sale_rows(start_date, end_date))
     
+    def _group_items(self, rows: np.ndarray, key: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Total line items per product name or category.
+        
+        Args:
+            rows: Line-item indices (from _item_rows)
+            key: Item column to group by ('name' or 'category')
+            
+        Returns:
+            Tuple of the group number of each item, and a dict of arrays with
+            one entry per group in first-sold order: code (the value code),
+            revenue, quantity_sold, transactions and qty_float
+        """
+        cols = self._sales_columns()
+        codes, groups = pd.factorize(cols[key][rows])
+        revenue, quantity, lines = _group_totals(codes, cols['qty'][rows], cols['price'][rows], len(groups))
+        stats = {
+            'code': groups,
+            'revenue': revenue,
+            'quantity_sold': quantity,
+            'transactions': lines,
+            'qty_float': np.bincount(codes, weights=cols['qty_float'][rows], minlength=len(groups)) > 0
+        }
+        return codes, stats
+    
+    @staticmethod
+    def _by_revenue(stats: Dict[str, np.ndarray]) -> Dict[str, list]:
+        """Sort grouped totals by revenue, highest first (stable, so ties keep first-sold order)."""
+        order = np.argsort(-stats['revenue'], kind='stable')
+        return {column: values[order].tolist() for column, values in stats.items()}
+    
+    @_memoized
     def get_sales_summary(self, start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
         """
         Get comprehensive sales summary for a date range.
@@ -134,13 +536,11 @@ class SalesAnalytics:
         if end_date is None:
             end_date = datetime.now()
         
-        # Filter sales by date range
-        filtered_sales = [
-            sale for sale in self.sales_records
-            if start_date <= sale.timestamp <= end_date
-        ]
+        cols = self._sales_columns()
+        rows = self._sale_rows(start_date, end_date)
+        totals = cols['total'][rows]
         
-        if not filtered_sales:
+        if not totals.size:
             return {
                 'total_sales': 0,
                 'total_revenue': 0.0,
@@ -150,9 +550,9 @@ class SalesAnalytics:
                 'date_range': f"{start_date.date()} to {end_date.date()}"
             }
         
-        total_revenue = sum(sale.total for sale in filtered_sales)
-        total_tax = sum(sale.tax for sale in filtered_sales)
-        total_transactions = len(filtered_sales)
+        total_revenue = float(totals.sum())
+        total_tax = float(cols['tax'][rows].sum())
+        total_transactions = int(totals.size)
         average_sale = total_revenue / total_transactions
         
         return {
@@ -164,6 +564,7 @@ class SalesAnalytics:
             'date_range': f"{start_date.date()} to {end_date.date()}"
         }
     
+    @_memoized
     def get_product_performance(self, start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
         """
         Analyze product performance and sales.
@@ -180,44 +581,24 @@ class SalesAnalytics:
         if end_date is None:
             end_date = datetime.now()
         
-        # Filter sales by date range
-        filtered_sales = [
-            sale for sale in self.sales_records
-            if start_date <= sale.timestamp <= end_date
-        ]
-        
-        # Collect product data
-        product_stats = defaultdict(lambda: {
-            'quantity_sold': 0,
-            'revenue': 0.0,
-            'transactions': 0
-        })
+        _, stats = self._group_items(self._item_rows(start_date, end_date), 'name')
         
-        for sale in filtered_sales:
-            for item in sale.items:
-                product_id = item.get('id', 'unknown')
-                product_name = item.get('name', 'Unknown Product')
-                quantity = item.get('quantity', 0)
-                price = item.get('price', 0.0)
-                
-                product_stats[product_name]['quantity_sold'] += quantity
-                product_stats[product_name]['revenue'] += quantity * price
-                product_stats[product_name]['transactions'] += 1
-        
-        # Convert to list and sort by revenue
+        # Sort by revenue
+        stats = self._by_revenue(stats)
+        values = self._sales_columns().values
         product_list = [
             {
-                'name': name,
-                'quantity_sold': stats['quantity_sold'],
-                'revenue': stats['revenue'],
-                'transactions': stats['transactions'],
-                'average_price': stats['revenue'] / stats['quantity_sold'] if stats['quantity_sold'] > 0 else 0
+                'name': values[code],
+                'quantity_sold': quantity if qty_float else int(quantity),
+                'revenue': revenue,
+                'transactions': transactions,
+                'average_price': revenue / quantity if quantity > 0 else 0
             }
-            for name, stats in product_stats.items()
+            for code, quantity, revenue, transactions, qty_float in zip(
+                stats['code'], stats['quantity_sold'], stats['revenue'],
+                stats['transactions'], stats['qty_float'])
         ]
         
-        product_list.sort(key=lambda x: x['revenue'], reverse=True)
-        
         return {
             'products': product_list,
             'top_sellers': product_list[:10],
@@ -239,42 +620,35 @@ class SalesAnalytics:
         start_date = end_date - timedelta(days=days)
         
         # Create date range
-        date_range = []
-        current_date = start_date
-        while current_date <= end_date:
-            date_range.append(current_date.date())
-            current_date += timedelta(days=1)
-        
-        # Group sales by date
-        daily_sales = defaultdict(lambda: {
-            'revenue': 0.0,
-            'transactions': 0,
-            'items_sold': 0
-        })
-        
-        for sale in self.sales_records:
-            if start_date <= sale.timestamp <= end_date:
-                date_key = sale.timestamp.date()
-                daily_sales[date_key]['revenue'] += sale.total
-                daily_sales[date_key]['transactions'] += 1
-                daily_sales[date_key]['items_sold'] += sum(item.get('quantity', 0) for item in sale.items)
+        date_range = pd.date_range(start_date.date(), end_date.date(), freq='D').date
+        
+        # Group sales by day offset from the first date
+        rows = self._sale_rows(start_date, end_date)
+        cols = self._sales_columns()
+        first_day = to_micros(start_date) // DAY_MICROS
+        day_index = cols['day'][rows] - first_day
+        n_days = len(date_range)
+        revenue = np.bincount(day_index, weights=cols['total'][rows], minlength=n_days).astype(np.float64)
+        transactions = np.bincount(day_index, minlength=n_days)
+        items_sold = np.bincount(day_index, weights=cols['items'][rows], minlength=n_days)
+        # Item counts stay ints unless a day summed a float quantity
+        items_float = np.bincount(day_index, weights=cols['items_float'][rows], minlength=n_days) > 0
+        items_sold = [count if is_float else int(count)
+                      for count, is_float in zip(items_sold.tolist(), items_float.tolist())]
         
         # Create complete data for all dates
-        trend_data = []
-        for date in date_range:
-            sales_data = daily_sales[date]
-            trend_data.append({
-                'date': date,
-                'revenue': sales_data['revenue'],
-                'transactions': sales_data['transactions'],
-                'items_sold': sales_data['items_sold']
-            })
+        trend_data = [
+            {'date': date, 'revenue': day_revenue, 'transactions': day_transactions, 'items_sold': day_items}
+            for date, day_revenue, day_transactions, day_items
+            in zip(date_range, revenue.tolist(), transactions.tolist(), items_sold)
+        ]
         
+        total_revenue = float(revenue.sum())
         return {
             'daily_data': trend_data,
-            'total_revenue': sum(day['revenue'] for day in trend_data),
-            'total_transactions': sum(day['transactions'] for day in trend_data),
-            'average_daily_revenue': sum(day['revenue'] for day in trend_data) / len(trend_data)
+            'total_revenue': total_revenue,
+            'total_transactions': int(transactions.sum()),
+            'average_daily_revenue': total_revenue / len(trend_data)
         }
     
     def get_hourly_sales_pattern(self, days: int = 7) -> Dict[str, Any]:
@@ -290,33 +664,24 @@ class SalesAnalytics:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        # Filter sales by date range
-        filtered_sales = [
-            sale for sale in self.sales_records
-            if start_date <= sale.timestamp <= end_date
-        ]
-        
-        # Group sales by hour
-        hourly_sales = defaultdict(lambda: {
-            'revenue': 0.0,
-            'transactions': 0
-        })
-        
-        for sale in filtered_sales:
-            hour = sale.timestamp.hour
-            hourly_sales[hour]['revenue'] += sale.total
-            hourly_sales[hour]['transactions'] += 1
+        # Bucket the sales by hour of day
+        rows = self._sale_rows(start_date, end_date)
+        cols = self._sales_columns()
+        hours = cols['hour'][rows]
+        # (float cast: bincount returns ints when no sale is in range)
+        revenue = np.bincount(hours, weights=cols['total'][rows], minlength=24).astype(np.float64)
+        transactions = np.bincount(hours, minlength=24)
         
         # Create complete hourly data
-        hourly_data = []
-        for hour in range(24):
-            sales_data = hourly_sales[hour]
-            hourly_data.append({
+        hourly_data = [
+            {
                 'hour': hour,
-                'revenue': sales_data['revenue'],
-                'transactions': sales_data['transactions'],
-                'average_transaction': sales_data['revenue'] / sales_data['transactions'] if sales_data['transactions'] > 0 else 0
-            })
+                'revenue': hour_revenue,
+                'transactions': hour_transactions,
+                'average_transaction': hour_revenue / hour_transactions if hour_transactions > 0 else 0
+            }
+            for hour, hour_revenue, hour_transactions in zip(range(24), revenue.tolist(), transactions.tolist())
+        ]
         
         return {
             'hourly_data': hourly_data,
@@ -324,63 +689,65 @@ class SalesAnalytics:
             'quiet_hour': min(hourly_data, key=lambda x: x['revenue'])
         }
     
-    def get_category_performance(self, start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
+    @_memoized
+    def get_category_frame(self, start_date: datetime = None, end_date: datetime = None) -> pd.DataFrame:
         """
-        Analyze sales performance by category.
+        Get per-category sales totals as a DataFrame, for consumers that want arrays.
         
         Args:
             start_date: Start date for analysis
             end_date: End date for analysis
             
         Returns:
-            Dictionary with category performance data
+            DataFrame with one row per category, highest revenue first, and
+            columns category, revenue, quantity_sold, transactions,
+            product_count and qty_float (True if any quantity was a float)
         """
         if start_date is None:
             start_date = datetime.now() - timedelta(days=30)
         if end_date is None:
             end_date = datetime.now()
         
-        # Filter sales by date range
-        filtered_sales = [
-            sale for sale in self.sales_records
-            if start_date <= sale.timestamp <= end_date
-        ]
-        
-        # Collect category data
-        category_stats = defaultdict(lambda: {
-            'revenue': 0.0,
-            'quantity_sold': 0,
-            'transactions': 0,
-            'products': set()
-        })
+        rows = self._item_rows(start_date, end_date)
+        codes, stats = self._group_items(rows, 'category')
+        names = self._sales_columns()['category_name'][rows]
+        # Distinct products per category; every group code 0..n-1 occurs, so the sorted groupby lines up
+        stats['product_count'] = pd.Series(names).groupby(codes).nunique().to_numpy(dtype=np.int64)
+        
+        order = np.argsort(-stats['revenue'], kind='stable')
+        values = self._sales_columns().values
+        frame = pd.DataFrame({column: column_values[order] for column, column_values in stats.items()})
+        frame.insert(0, 'category', pd.Series([values[code] for code in frame.pop('code').tolist()],
+                                              dtype=object))
+        return frame
+    
+    @_memoized
+    def get_category_performance(self, start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
+        """
+        Analyze sales performance by category.
         
-        for sale in filtered_sales:
-            for item in sale.items:
-                category = item.get('category', 'Uncategorized')
-                quantity = item.get('quantity', 0)
-                price = item.get('price', 0.0)
-                product_name = item.get('name', 'Unknown')
-                
-                category_stats[category]['revenue'] += quantity * price
-                category_stats[category]['quantity_sold'] += quantity
-                category_stats[category]['transactions'] += 1
-                category_stats[category]['products'].add(product_name)
-        
-        # Convert to list
+        Args:
+            start_date: Start date for analysis
+            end_date: End date for analysis
+            
+        Returns:
+            Dictionary with category performance data
+        """
+        frame = self.get_category_frame(start_date, end_date)
         category_list = [
             {
                 'category': category,
-                'revenue': stats['revenue'],
-                'quantity_sold': stats['quantity_sold'],
-                'transactions': stats['transactions'],
-                'product_count': len(stats['products']),
-                'average_transaction': stats['revenue'] / stats['transactions'] if stats['transactions'] > 0 else 0
+                'revenue': revenue,
+                'quantity_sold': quantity if qty_float else int(quantity),
+                'transactions': transactions,
+                'product_count': product_count,
+                'average_transaction': revenue / transactions if transactions > 0 else 0
             }
-            for category, stats in category_stats.items()
+            for category, revenue, quantity, transactions, product_count, qty_float in zip(
+                frame['category'].tolist(), frame['revenue'].tolist(), frame['quantity_sold'].tolist(),
+                frame['transactions'].tolist(), frame['product_count'].tolist(), frame['qty_float'].tolist())
         ]
         
-        category_list.sort(key=lambda x: x['revenue'], reverse=True)
-        
         return {
             'categories': category_list,
             'top_category': category_list[0] if category_list else None,
@@ -451,10 +818,7 @@ class SalesAnalytics:
                     json.dump(report_data, f, indent=4, ensure_ascii=False)
             
             elif format == "csv":
-                # Flatten the report data for CSV export
-                flattened_data = self._flatten_report_data(report_data)
-                df = pd.DataFrame(flattened_data)
-                df.to_csv(filepath, index=False)
+                self._report_frame(report_data).to_csv(filepath, index=False)
             
             elif format == "txt":
                 with open(filepath, 'w', encoding='utf-8') as f:
@@ -466,62 +830,52 @@ class SalesAnalytics:
             print(f"Error exporting report: {e}")
             return False
     
-    def _flatten_report_data(self, report_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Flatten report data for CSV export."""
-        flattened = []
-        
-        # Add summary data
+    def _report_frame(self, report_data: Dict[str, Any]) -> pd.DataFrame:
+        """Flatten report data into one table for CSV export."""
         summary = report_data.get('summary', {})
-        flattened.append({
-            'section': 'summary',
-            'metric': 'total_revenue',
-            'value': summary.get('total_revenue', 0)
-        })
-        flattened.append({
+        frame = pd.DataFrame({
             'section': 'summary',
-            'metric': 'total_transactions',
-            'value': summary.get('total_transactions', 0)
+            'metric': ['total_revenue', 'total_transactions'],
+            'value': [summary.get('total_revenue', 0), summary.get('total_transactions', 0)]
         })
         
-        # Add product performance data
-        product_perf = report_data.get('product_performance', {})
-        for product in product_perf.get('products', []):
-            flattened.append({
-                'section': 'product_performance',
-                'product_name': product['name'],
-                'quantity_sold': product['quantity_sold'],
-                'revenue': product['revenue'],
-                'transactions': product['transactions']
-            })
+        # Product performance rows, converted column-wise in one call
+        products = report_data.get('product_performance', {}).get('products', [])
+        if products:
+            product_frame = pd.DataFrame.from_records(
+                products, columns=['name', 'quantity_sold', 'revenue', 'transactions']
+            ).rename(columns={'name': 'product_name'})
+            product_frame.insert(0, 'section', 'product_performance')
+            frame = pd.concat([frame, product_frame], ignore_index=True)
         
-        return flattened
+        return frame
     
     def _format_report_as_text(self, report_data: Dict[str, Any]) -> str:
         """Format report data as readable text."""
-        text = []
-        text.append("=" * 60)
-        text.append("SALES ANALYTICS REPORT")
-        text.append("=" * 60)
-        text.append(f"Generated: {report_data.get('generated_at', 'Unknown')}")
-        text.append(f"Date Range: {report_data.get('date_range', {}).get('start', 'Unknown')} to {report_data.get('date_range', {}).get('end', 'Unknown')}")
-        text.append("")
-        
-        # Summary
+        date_range = report_data.get('date_range', {})
         summary = report_data.get('summary', {})
-        text.append("SUMMARY")
-        text.append("-" * 20)
-        text.append(f"Total Revenue: ${summary.get('total_revenue', 0):.2f}")
-        text.append(f"Total Transactions: {summary.get('total_transactions', 0)}")
-        text.append(f"Average Sale: ${summary.get('average_sale', 0):.2f}")
-        text.append("")
+        text = [
+            "=" * 60,
+            "SALES ANALYTICS REPORT",
+            "=" * 60,
+            f"Generated: {report_data.get('generated_at', 'Unknown')}",
+            f"Date Range: {date_range.get('start', 'Unknown')} to {date_range.get('end', 'Unknown')}",
+            "",
+            # Summary
+            "SUMMARY",
+            "-" * 20,
+            f"Total Revenue: ${summary.get('total_revenue', 0):.2f}",
+            f"Total Transactions: {summary.get('total_transactions', 0)}",
+            f"Average Sale: ${summary.get('average_sale', 0):.2f}",
+            "",
+        ]
         
         # Top Products
-        product_perf = report_data.get('product_performance', {})
-        if product_perf.get('top_sellers'):
-            text.append("TOP SELLING PRODUCTS")
-            text.append("-" * 25)
-            for i, product in enumerate(product_perf['top_sellers'][:5], 1):
-                text.append(f"{i}. {product['name']} - ${product['revenue']:.2f} ({product['quantity_sold']} units)")
+        top_sellers = report_data.get('product_performance', {}).get('top_sellers')
+        if top_sellers:
+            text += ["TOP SELLING PRODUCTS", "-" * 25]
+            text += [f"{i}. {product['name']} - ${product['revenue']:.2f} ({product['quantity_sold']} units)"
+                     for i, product in enumerate(top_sellers[:5], 1)]
             text.append("")
         
         return "\n".join(text)
@@ -540,11 +894,25 @@ class SalesVisualization:
         """
         self.analytics = analytics
     
-    def create_daily_sales_chart(self, days: int = 30) -> Figure:
-        """Create daily sales trend chart."""
-        trend_data = self.analytics.get_daily_sales_trend(days)
+    def daily_sales_data(self, days: int = 30) -> Dict[str, Any]:
+        """Query the data plotted by the daily sales chart."""
+        return self.analytics.get_daily_sales_trend(days)
+    
+    def product_performance_data(self, days: int = 30) -> Dict[str, Any]:
+        """Query the data plotted by the product performance chart."""
+        return self.analytics.get_product_performance(*_recent_window(days))
+    
+    def category_performance_data(self, days: int = 30) -> pd.DataFrame:
+        """Query the data plotted by the category performance chart."""
+        return self.analytics.get_category_frame(*_recent_window(days))
+    
+    def create_daily_sales_chart(self, days: int = 30, trend_data: Dict[str, Any] = None) -> Figure:
+        """Create daily sales trend chart (from trend_data if already queried)."""
+        if trend_data is None:
+            trend_data = self.daily_sales_data(days)
         
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+        fig = Figure(figsize=(12, 8))
+        ax1, ax2 = fig.subplots(2, 1)
         
         dates = [day['date'] for day in trend_data['daily_data']]
         revenues = [day['revenue'] for day in trend_data['daily_data']]
@@ -567,20 +935,68 @@ class SalesVisualization:
         ax2.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
         ax2.xaxis.set_major_locator(mdates.DayLocator(interval=7))
         
-        plt.tight_layout()
+        fig.tight_layout()
+        return fig
+    
+    def update_daily_sales_chart(self, fig: Figure, days: int = 30, trend_data: Dict[str, Any] = None) -> None:
+        """
+        Refresh a figure from create_daily_sales_chart in place.
+        
+        The revenue line and transaction bars are moved to the new data, so
+        axes, titles and tick formatters are kept rather than rebuilt.
+        
+        Args:
+            fig: Figure returned by create_daily_sales_chart
+            days: Number of days to chart
+            trend_data: Result of daily_sales_data(days), queried if omitted
+        """
+        if trend_data is None:
+            trend_data = self.daily_sales_data(days)
+        ax1, ax2 = fig.axes
+        
+        dates = [day['date'] for day in trend_data['daily_data']]
+        revenues = [day['revenue'] for day in trend_data['daily_data']]
+        transactions = [day['transactions'] for day in trend_data['daily_data']]
+        
+        ax1.lines[0].set_data(dates, revenues)
+        
+        bars = ax2.containers[0]
+        if len(bars) == len(dates):
+            for bar, x, height in zip(bars, mdates.date2num(dates), transactions):
+                bar.set_x(x - bar.get_width() / 2)
+                bar.set_height(height)
+        else:
+            # A different period needs a different number of bars
+            bars.remove()
+            ax2.bar(dates, transactions, alpha=0.7, color='skyblue')
+        
+        for ax in (ax1, ax2):
+            ax.relim()
+            ax.autoscale_view()
+    
+    def create_product_performance_chart(self, days: int = 30, product_data: Dict[str, Any] = None) -> Figure:
+        """Create product performance chart (from product_data if already queried)."""
+        fig = Figure(figsize=(15, 8))
+        fig.subplots(1, 2)
+        self._draw_product_performance(fig, days, product_data)
         return fig
     
-    def create_product_performance_chart(self, days: int = 30) -> Figure:
-        """Create product performance chart."""
-        product_data = self.analytics.get_product_performance(
-            datetime.now() - timedelta(days=days),
-            datetime.now()
-        )
+    def update_product_performance_chart(self, fig: Figure, days: int = 30,
+                                         product_data: Dict[str, Any] = None) -> None:
+        """Redraw a figure from create_product_performance_chart in place."""
+        for ax in fig.axes:
+            ax.clear()
+        self._draw_product_performance(fig, days, product_data)
+    
+    def _draw_product_performance(self, fig: Figure, days: int, product_data: Optional[Dict[str, Any]]):
+        """Plot top product revenue and quantity onto the figure's two axes."""
+        if product_data is None:
+            product_data = self.product_performance_data(days)
         
         # Get top 10 products
         top_products = product_data['top_sellers'][:10]
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 8))
+        ax1, ax2 = fig.axes
         
         # Revenue by product
         product_names = [p['name'][:20] + '...' if len(p['name']) > 20 else p['name'] for p in top_products]
@@ -609,14 +1025,14 @@ class SalesVisualization:
             ax2.text(bar.get_width() + max(quantities) * 0.01, bar.get_y() + bar.get_height()/2,
                     f'{quantity}', va='center', fontsize=10)
         
-        plt.tight_layout()
-        return fig
+        fig.tight_layout()
     
     def create_hourly_pattern_chart(self, days: int = 7) -> Figure:
         """Create hourly sales pattern chart."""
         hourly_data = self.analytics.get_hourly_sales_pattern(days)
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        fig = Figure(figsize=(15, 6))
+        ax1, ax2 = fig.subplots(1, 2)
         
         hours = [data['hour'] for data in hourly_data['hourly_data']]
         revenues = [data['revenue'] for data in hourly_data['hourly_data']]
@@ -638,21 +1054,33 @@ class SalesVisualization:
         ax2.set_xticks(range(0, 24, 2))
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
+        return fig
+    
+    def create_category_performance_chart(self, days: int = 30, category_data: pd.DataFrame = None) -> Figure:
+        """Create category performance chart (from category_data if already queried)."""
+        fig = Figure(figsize=(15, 8))
+        fig.subplots(1, 2)
+        self._draw_category_performance(fig, days, category_data)
         return fig
     
-    def create_category_performance_chart(self, days: int = 30) -> Figure:
-        """Create category performance chart."""
-        category_data = self.analytics.get_category_performance(
-            datetime.now() - timedelta(days=days),
-            datetime.now()
-        )
+    def update_category_performance_chart(self, fig: Figure, days: int = 30,
+                                          category_data: pd.DataFrame = None) -> None:
+        """Redraw a figure from create_category_performance_chart in place."""
+        for ax in fig.axes:
+            ax.clear()
+        self._draw_category_performance(fig, days, category_data)
+    
+    def _draw_category_performance(self, fig: Figure, days: int, category_data: Optional[pd.DataFrame]):
+        """Plot category revenue share and quantity onto the figure's two axes."""
+        if category_data is None:
+            category_data = self.category_performance_data(days)
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 8))
+        ax1, ax2 = fig.axes
         
-        categories = [cat['category'] for cat in category_data['categories']]
-        revenues = [cat['revenue'] for cat in category_data['categories']]
-        quantities = [cat['quantity_sold'] for cat in category_data['categories']]
+        categories = category_data['category'].to_numpy()
+        revenues = category_data['revenue'].to_numpy()
+        quantities = category_data['quantity_sold'].to_numpy()
         
         # Revenue by category (pie chart)
         ax1.pie(revenues, labels=categories, autopct='%1.1f%%', startangle=90)
@@ -666,18 +1094,26 @@ class SalesVisualization:
         ax2.tick_params(axis='x', rotation=45)
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        return fig
+        fig.tight_layout()
 
 class SalesDashboard(tk.Toplevel):
     """
     Interactive sales dashboard with charts and analytics.
     """
     
+    # How often a tab checks whether its chart query has finished
+    _CHART_POLL_MS = 50
+    
     def __init__(self, parent, analytics: SalesAnalytics):
         super().__init__(parent)
         self.analytics = analytics
         self.visualization = SalesVisualization(analytics)
+        # One worker, so chart queries never run concurrently with each other
+        self._chart_executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_charts = {}  # tab frame -> (query future, after() poll id)
+        self._canvases = {}  # tab frame -> FigureCanvasTkAgg, reused across refreshes
+        self._summary_labels = {}  # summary key -> value label of its card
+        self._last_labels = {}  # tab frame -> label of the inputs it currently shows
         
         self.title("Sales Analytics Dashboard")
         self.geometry("1400x900")
@@ -741,33 +1177,41 @@ class SalesDashboard(tk.Toplevel):
         try:
             days = int(self.period_var.get())
             
-            # Update summary
-            self.update_summary(days)
-            
-            # Update charts
-            self.update_charts(days)
-            
-            # Update product analysis
-            self.update_product_analysis(days)
-            
-            # Update category analysis
-            self.update_category_analysis(days)
+            # Period, data version and the current minute fully determine a
+            # tab; tabs already showing the same label are left as they are
+            label = (days, self.analytics.data_version, datetime.now().replace(second=0, microsecond=0))
+            tabs = (
+                (self.summary_frame, self.update_summary),
+                (self.charts_frame, self.update_charts),
+                (self.products_frame, self.update_product_analysis),
+                (self.categories_frame, self.update_category_analysis),
+            )
+            for frame, update in tabs:
+                if self._last_labels.get(frame) != label:
+                    self._last_labels[frame] = label
+                    update(days)
             
         except Exception as e:
+            self._last_labels.clear()
             messagebox.showerror("Error", f"Error refreshing dashboard: {e}")
     
     def update_summary(self, days: int):
         """Update summary statistics."""
-        # Clear existing widgets
-        for widget in self.summary_frame.winfo_children():
-            widget.destroy()
+        # Build the cards on the first refresh; later refreshes only change their text
+        if not self._summary_labels:
+            self._create_summary_cards()
         
         # Get summary data
-        summary = self.analytics.get_sales_summary(
-            datetime.now() - timedelta(days=days),
-            datetime.now()
-        )
+        summary = self.analytics.get_sales_summary(*_recent_window(days))
         
+        labels = self._summary_labels
+        labels['total_revenue'].configure(text=f"${summary['total_revenue']:,.2f}")
+        labels['total_transactions'].configure(text=f"{summary['total_transactions']:,}")
+        labels['average_sale'].configure(text=f"${summary['average_sale']:.2f}")
+        labels['date_range'].configure(text=summary['date_range'])
+    
+    def _create_summary_cards(self):
+        """Create the summary cards, keeping their value labels in self._summary_labels."""
         # Create summary cards
         cards_frame = ttk.Frame(self.summary_frame)
         cards_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -776,88 +1220,114 @@ class SalesDashboard(tk.Toplevel):
         for i in range(4):
             cards_frame.columnconfigure(i, weight=1)
         
-        # Total Revenue Card
-        revenue_frame = ttk.Frame(cards_frame, relief='solid', borderwidth=2)
-        revenue_frame.grid(row=0, column=0, padx=10, pady=10, sticky='nsew')
-        ttk.Label(revenue_frame, text="Total Revenue", font=('Segoe UI', 12, 'bold')).pack(pady=10)
-        ttk.Label(revenue_frame, text=f"${summary['total_revenue']:,.2f}", 
-                 font=('Segoe UI', 20, 'bold'), foreground='green').pack(pady=10)
-        
-        # Total Transactions Card
-        transactions_frame = ttk.Frame(cards_frame, relief='solid', borderwidth=2)
-        transactions_frame.grid(row=0, column=1, padx=10, pady=10, sticky='nsew')
-        ttk.Label(transactions_frame, text="Total Transactions", font=('Segoe UI', 12, 'bold')).pack(pady=10)
-        ttk.Label(transactions_frame, text=f"{summary['total_transactions']:,}", 
-                 font=('Segoe UI', 20, 'bold'), foreground='blue').pack(pady=10)
-        
-        # Average Sale Card
-        avg_frame = ttk.Frame(cards_frame, relief='solid', borderwidth=2)
-        avg_frame.grid(row=0, column=2, padx=10, pady=10, sticky='nsew')
-        ttk.Label(avg_frame, text="Average Sale", font=('Segoe UI', 12, 'bold')).pack(pady=10)
-        ttk.Label(avg_frame, text=f"${summary['average_sale']:.2f}", 
-                 font=('Segoe UI', 20, 'bold'), foreground='orange').pack(pady=10)
-        
-        # Date Range Card
-        date_frame = ttk.Frame(cards_frame, relief='solid', borderwidth=2)
-        date_frame.grid(row=0, column=3, padx=10, pady=10, sticky='nsew')
-        ttk.Label(date_frame, text="Date Range", font=('Segoe UI', 12, 'bold')).pack(pady=10)
-        ttk.Label(date_frame, text=summary['date_range'], 
-                 font=('Segoe UI', 12), wraplength=150).pack(pady=10)
+        cards = [
+            ('total_revenue', "Total Revenue", {'font': ('Segoe UI', 20, 'bold'), 'foreground': 'green'}),
+            ('total_transactions', "Total Transactions", {'font': ('Segoe UI', 20, 'bold'), 'foreground': 'blue'}),
+            ('average_sale', "Average Sale", {'font': ('Segoe UI', 20, 'bold'), 'foreground': 'orange'}),
+            ('date_range', "Date Range", {'font': ('Segoe UI', 12), 'wraplength': 150}),
+        ]
+        for column, (key, title, value_style) in enumerate(cards):
+            card_frame = ttk.Frame(cards_frame, relief='solid', borderwidth=2)
+            card_frame.grid(row=0, column=column, padx=10, pady=10, sticky='nsew')
+            ttk.Label(card_frame, text=title, font=('Segoe UI', 12, 'bold')).pack(pady=10)
+            self._summary_labels[key] = ttk.Label(card_frame, **value_style)
+            self._summary_labels[key].pack(pady=10)
     
     def update_charts(self, days: int):
         """Update charts tab."""
-        # Clear existing widgets
-        for widget in self.charts_frame.winfo_children():
-            widget.destroy()
-        
-        # Create charts
-        try:
-            # Daily sales chart
-            daily_fig = self.visualization.create_daily_sales_chart(days)
-            daily_canvas = FigureCanvasTkAgg(daily_fig, self.charts_frame)
-            daily_canvas.draw()
-            daily_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
-        except Exception as e:
-            ttk.Label(self.charts_frame, text=f"Error creating charts: {e}").pack(pady=20)
+        # Daily sales chart
+        self._show_chart(self.charts_frame, self.visualization.daily_sales_data,
+                         self.visualization.create_daily_sales_chart,
+                         self.visualization.update_daily_sales_chart, days, "Error creating charts")
     
     def update_product_analysis(self, days: int):
         """Update product analysis tab."""
-        # Clear existing widgets
-        for widget in self.products_frame.winfo_children():
-            widget.destroy()
-        
-        try:
-            # Get product data
-            product_data = self.analytics.get_product_performance(
-                datetime.now() - timedelta(days=days),
-                datetime.now()
-            )
-            
-            # Create product chart
-            product_fig = self.visualization.create_product_performance_chart(days)
-            product_canvas = FigureCanvasTkAgg(product_fig, self.products_frame)
-            product_canvas.draw()
-            product_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
-        except Exception as e:
-            ttk.Label(self.products_frame, text=f"Error creating product analysis: {e}").pack(pady=20)
+        # Product chart
+        self._show_chart(self.products_frame, self.visualization.product_performance_data,
+                         self.visualization.create_product_performance_chart,
+                         self.visualization.update_product_performance_chart, days,
+                         "Error creating product analysis")
     
     def update_category_analysis(self, days: int):
         """Update category analysis tab."""
-        # Clear existing widgets
-        for widget in self.categories_frame.winfo_children():
-            widget.destroy()
+        # Category chart
+        self._show_chart(self.categories_frame, self.visualization.category_performance_data,
+                         self.visualization.create_category_performance_chart,
+                         self.visualization.update_category_performance_chart, days,
+                         "Error creating category analysis")
+    
+    def _show_chart(self, frame, query, create, update, days: int, error_text: str):
+        """
+        Start a chart's data query on the worker thread; _poll_chart draws it.
+        
+        The analytics query is the slow part of a refresh, so it runs off the
+        Tk main loop. Figures are only created and drawn on the main thread,
+        since matplotlib and Tk are not thread-safe.
+        
+        Args:
+            frame: Tab frame holding the chart
+            query: SalesVisualization method returning the chart's data
+            create: SalesVisualization method building the figure from that data
+            update: SalesVisualization method refreshing that figure in place
+            days: Number of days to chart
+            error_text: Message prefix shown in the tab if the chart fails
+        """
+        # A newer refresh supersedes a query still waiting for this tab
+        pending = self._pending_charts.pop(frame, None)
+        if pending is not None:
+            pending[0].cancel()
+            self.after_cancel(pending[1])
+        future = self._chart_executor.submit(query, days)
+        job = self.after(self._CHART_POLL_MS, self._poll_chart, frame, future, create, update, days, error_text)
+        self._pending_charts[frame] = (future, job)
+    
+    def _poll_chart(self, frame, future, create, update, days: int, error_text: str):
+        """
+        Draw a chart once its query has finished, reusing the tab's figure and canvas.
+        
+        Building a figure and its Tk canvas is expensive, so it only happens
+        the first time (or after an error); afterwards the existing figure is
+        updated and redrawn when idle.
+        """
+        if not future.done():
+            job = self.after(self._CHART_POLL_MS, self._poll_chart, frame, future, create, update, days, error_text)
+            self._pending_charts[frame] = (future, job)
+            return
+        del self._pending_charts[frame]
         
         try:
-            # Create category chart
-            category_fig = self.visualization.create_category_performance_chart(days)
-            category_canvas = FigureCanvasTkAgg(category_fig, self.categories_frame)
-            category_canvas.draw()
-            category_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
+            data = future.result()
+            canvas = self._canvases.get(frame)
+            if canvas is None:
+                for widget in frame.winfo_children():
+                    widget.destroy()
+                canvas = FigureCanvasTkAgg(create(days, data), frame)
+                canvas.draw_idle()
+                canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+                self._canvases[frame] = canvas
+            else:
+                update(canvas.figure, days, data)
+                canvas.draw_idle()
+        
         except Exception as e:
-            ttk.Label(self.categories_frame, text=f"Error creating category analysis: {e}").pack(pady=20)
+            self._show_chart_error(frame, f"{error_text}: {e}")
+    
+    def destroy(self):
+        """Cancel pending chart queries and close the dashboard."""
+        for future, job in self._pending_charts.values():
+            future.cancel()
+            self.after_cancel(job)
+        self._pending_charts.clear()
+        self._chart_executor.shutdown(wait=False)
+        super().destroy()
+    
+    def _show_chart_error(self, frame, message: str):
+        """Replace a tab's chart with an error message."""
+        self._last_labels.pop(frame, None)
+        self._canvases.pop(frame, None)
+        for widget in frame.winfo_children():
+            widget.destroy()
+        ttk.Label(frame, text=message).pack(pady=20)
     
     def export_report(self):
         """Export current report."""
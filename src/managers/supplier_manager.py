@@ -8,12 +8,15 @@ This module provides comprehensive supplier management capabilities including:
 - Order history tracking
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple, Union
 from datetime import datetime
-from dataclasses import dataclass, asdict
-import json
+from dataclasses import dataclass, field, fields, MISSING
+import functools
+import hashlib
 import os
 from pathlib import Path
+from src.models import DAY_MICROS, to_micros
+from src.utils.io_utils import atomic_write, dumps_json, loads_json
 
 @dataclass
 class Supplier:
@@ -45,6 +48,86 @@ class PurchaseOrder:
     notes: str = ""
     created_at: str = ""
     updated_at: str = ""
+    # Date field name -> (its value, epoch microseconds), parsed on first use
+    _parsed: Dict[str, Tuple[str, int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def date_micros(self, name: str) -> int:
+        """
+        Epoch microseconds of one of the ISO date fields.
+        
+        Args:
+            name: Field name ('expected_delivery', 'updated_at', ...)
+            
+        Returns:
+            int: The parsed date, cached until the field is reassigned
+        """
+        text = getattr(self, name)
+        cached = self._parsed.get(name)
+        if cached is None or cached[0] is not text:
+            cached = self._parsed[name] = (text, to_micros(datetime.fromisoformat(text)))
+        return cached[1]
+
+def _order_total(items: List[Dict[str, Any]]) -> float:
+    """Sum quantity * unit_price over purchase order lines (missing keys count as 0)."""
+    total = 0
+    try:
+        # Lines normally carry both keys, so index them directly in a plain loop
+        for item in items:
+            total += item['quantity'] * item['unit_price']
+        return total
+    except KeyError:
+        return sum(item.get('quantity', 0) * item.get('unit_price', 0) for item in items)
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> tuple:
+    """Names of a dataclass's stored fields (those taken by __init__), in declaration order."""
+    return tuple(f.name for f in fields(cls) if f.init)
+
+def _shallow_dict(record: Any) -> Dict[str, Any]:
+    """Field values of a dataclass record, without the deep copy made by asdict."""
+    return {name: getattr(record, name) for name in _field_names(type(record))}
+
+# Valid purchase order statuses, each mapped to the one string instance that
+# orders store, so loaded orders share it instead of holding a parsed copy each
+_PO_STATUSES = {status: status for status in ('pending', 'confirmed', 'shipped', 'delivered', 'cancelled')}
+
+# Keys a stored purchase order must / may have to build a PurchaseOrder
+_PO_FIELDS = frozenset(_field_names(PurchaseOrder))
+_PO_REQUIRED_FIELDS = frozenset(f.name for f in fields(PurchaseOrder)
+                                if f.init and f.default is MISSING and f.default_factory is MISSING)
+
+def _encode_records(records: Dict[str, Any]) -> bytes:
+    """
+    Encode a dict of dataclass records as a JSON object file's contents.
+    
+    Each record is encoded on its own line, so no intermediate dict of the
+    whole store is built.
+    
+    Args:
+        records: Records keyed by id; dataclass instances, or stored dicts
+            not yet built into one
+    
+    Returns:
+        bytes: The UTF-8 JSON document
+    """
+    parts = [b'{']
+    separator = b'\n'
+    for record_id, record in records.items():
+        data = record if type(record) is dict else _shallow_dict(record)
+        parts.append(separator + dumps_json(record_id) + b':' + dumps_json(data))
+        separator = b',\n'
+    parts.append(b'\n}\n')
+    return b''.join(parts)
+
+def _digest(payload: bytes) -> bytes:
+    """Short content hash used to tell whether a store's file needs rewriting."""
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+def _next_seq(ids: Iterable[str], prefix: str) -> int:
+    """One past the highest number among ids of the form <prefix><digits> (1 if none)."""
+    start = len(prefix)
+    return max((int(i[start:]) for i in ids if i.startswith(prefix) and i[start:].isdigit()),
+               default=0) + 1
 
 class SupplierManager:
     """Manages supplier relationships and purchase orders."""
@@ -54,51 +137,199 @@ class SupplierManager:
         self.data_path = Path(data_path)
         self.data_path.mkdir(exist_ok=True)
         self.suppliers: Dict[str, Supplier] = {}
-        self.purchase_orders: Dict[str, PurchaseOrder] = {}
+        # Purchase orders by id; loaded orders stay stored dicts until get_po()
+        # (or the purchase_orders property) builds them, and _unbuilt counts those
+        self._purchase_orders: Dict[str, Union[PurchaseOrder, Dict[str, Any]]] = {}
+        self._unbuilt = 0
+        # Purchase order ids per supplier, in creation order
+        self._pos_by_supplier: Dict[str, List[str]] = {}
+        # Per supplier, the (name, contact_person) last seen by search_suppliers
+        # and their lowercased forms; refreshed when either field changes
+        self._search_keys: Dict[str, Tuple[str, str, str, str]] = {}
+        # Next supplier / purchase order numbers, saved to counters.json so
+        # ids are never reused
+        self._next_sup = 1
+        self._next_po = 1
+        # Stores ('suppliers' / 'purchase_orders') changed since the last save;
+        # written by flush() or at the end of a `with` batch
+        self._dirty: Set[str] = set()
+        self._batch_depth = 0
+        # Per file name, (content digest, size, mtime_ns) of what was last
+        # read or written, so saves can skip files whose bytes would not change
+        self._saved: Dict[str, Tuple[bytes, int, int]] = {}
         self.load_data()
     
+    def __enter__(self) -> 'SupplierManager':
+        """Batch mutations: each changed file is written once when the block exits."""
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush()
+    
     def load_data(self) -> None:
         """Load supplier and purchase order data from storage."""
+        counters: Dict[str, int] = {}
         try:
             # Load suppliers
             supplier_file = self.data_path / "suppliers.json"
             if supplier_file.exists():
-                with open(supplier_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for sup_id, sup_data in data.items():
-                        self.suppliers[sup_id] = Supplier(**sup_data)
+                raw = supplier_file.read_bytes()
+                self._remember(supplier_file, raw)
+                data = loads_json(raw)
+                for sup_id, sup_data in data.items():
+                    self.suppliers[sup_id] = Supplier(**sup_data)
             
             # Load purchase orders
             po_file = self.data_path / "purchase_orders.json"
             if po_file.exists():
-                with open(po_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for po_id, po_data in data.items():
-                        self.purchase_orders[po_id] = PurchaseOrder(**po_data)
+                raw = po_file.read_bytes()
+                self._remember(po_file, raw)
+                data = loads_json(raw)
+                # Reject bad records now rather than when they are first built
+                for keys in {frozenset(po_data) for po_data in data.values()}:
+                    if not _PO_REQUIRED_FIELDS <= keys <= _PO_FIELDS:
+                        raise TypeError(f"Invalid purchase order fields: {sorted(keys)}")
+                self._purchase_orders.update(data)
+            
+            # Load id counters
+            counter_file = self.data_path / "counters.json"
+            if counter_file.exists():
+                raw = counter_file.read_bytes()
+                self._remember(counter_file, raw)
+                counters = loads_json(raw)
         
         except Exception as e:
             print(f"Error loading supplier data: {e}")
+        
+        # Data saved before counters.json existed continues after its highest id
+        self._next_sup = max(counters.get('supplier', 1), _next_seq(self.suppliers, 'SUP'))
+        self._next_po = max(counters.get('purchase_order', 1), _next_seq(self._purchase_orders, 'PO'))
+        self._unbuilt = 0
+        self._pos_by_supplier = {}
+        for po_id, po in self._purchase_orders.items():
+            if type(po) is dict:
+                self._unbuilt += 1
+                status = po.get('status', 'pending')
+                if status in _PO_STATUSES:
+                    po['status'] = _PO_STATUSES[status]
+                self._index_po(po_id, po['supplier_id'])
+            else:
+                self._index_po(po_id, po.supplier_id)
+        self._search_keys = {}
+    
+    @property
+    def purchase_orders(self) -> Dict[str, PurchaseOrder]:
+        """All purchase orders by id; loaded orders are built on first access."""
+        if self._unbuilt:
+            for po_id in [po_id for po_id, po in self._purchase_orders.items() if type(po) is dict]:
+                self.get_po(po_id)
+        return self._purchase_orders
+    
+    def get_po(self, po_id: str) -> Optional[PurchaseOrder]:
+        """
+        Get a purchase order, building it from its stored data on first access.
+        
+        Args:
+            po_id: Purchase order ID
+            
+        Returns:
+            PurchaseOrder, or None if there is no such order
+        """
+        po = self._purchase_orders.get(po_id)
+        if type(po) is dict:
+            po = self._purchase_orders[po_id] = PurchaseOrder(**po)
+            self._unbuilt -= 1
+        return po
+    
+    def _index_po(self, po_id: str, supplier_id: str) -> None:
+        """Add a newly created or loaded purchase order to the lookup indexes."""
+        self._pos_by_supplier.setdefault(supplier_id, []).append(po_id)
+    
+    def _supplier_key(self, supplier_id: str, supplier: Supplier) -> Tuple[str, str, str, str]:
+        """A supplier's search key, relowered if its name or contact changed since last use."""
+        key = self._search_keys.get(supplier_id)
+        if key is None or key[0] is not supplier.name or key[1] is not supplier.contact_person:
+            key = self._search_keys[supplier_id] = (supplier.name, supplier.contact_person,
+                                                    supplier.name.lower(), supplier.contact_person.lower())
+        return key
     
     def save_data(self) -> None:
-        """Save supplier and purchase order data to storage."""
+        """
+        Save supplier and purchase order data to storage.
+        
+        A file is only rewritten if its encoded contents differ from what was
+        last read from or written to it, or the file changed on disk since.
+        """
+        self._save(('suppliers', 'purchase_orders'))
+    
+    def flush(self) -> None:
+        """Write the stores changed since the last save, if any."""
+        if self._dirty:
+            self._save(sorted(self._dirty, reverse=True))
+    
+    def _save(self, stores: Iterable[str]) -> None:
+        """
+        Write the given stores to their JSON files, along with the id counters.
+        
+        Args:
+            stores: 'suppliers' and/or 'purchase_orders'
+        """
         try:
-            # Save suppliers
-            supplier_data = {sid: asdict(sup) for sid, sup in self.suppliers.items()}
-            with open(self.data_path / "suppliers.json", 'w', encoding='utf-8') as f:
-                json.dump(supplier_data, f, indent=2)
+            for store in stores:
+                records = self.suppliers if store == 'suppliers' else self._purchase_orders
+                self._write_if_changed(self.data_path / f"{store}.json", _encode_records(records))
+                self._dirty.discard(store)
             
-            # Save purchase orders
-            po_data = {pid: asdict(po) for pid, po in self.purchase_orders.items()}
-            with open(self.data_path / "purchase_orders.json", 'w', encoding='utf-8') as f:
-                json.dump(po_data, f, indent=2)
+            self._write_if_changed(self.data_path / "counters.json",
+                                   dumps_json({'supplier': self._next_sup, 'purchase_order': self._next_po}))
         
         except Exception as e:
             print(f"Error saving supplier data: {e}")
     
+    def _remember(self, filepath: Path, payload: bytes) -> None:
+        """Record the contents and current stat of a file just read or written."""
+        st = filepath.stat()
+        self._saved[filepath.name] = (_digest(payload), st.st_size, st.st_mtime_ns)
+    
+    def _write_if_changed(self, filepath: Path, payload: bytes) -> None:
+        """
+        Write payload to filepath unless the file already holds exactly these bytes.
+        
+        Args:
+            filepath: Target JSON file
+            payload: Encoded file contents
+        """
+        saved = self._saved.get(filepath.name)
+        if saved is not None and saved[0] == _digest(payload):
+            try:
+                st = filepath.stat()
+                if (st.st_size, st.st_mtime_ns) == saved[1:]:
+                    return
+            except OSError:
+                pass
+        with atomic_write(filepath, 'wb', buffering=1 << 20) as f:
+            f.write(payload)
+        self._remember(filepath, payload)
+    
+    def _mark_dirty(self, store: str) -> None:
+        """
+        Record an unsaved change to a store, saving it now unless a batch is open.
+        
+        Args:
+            store: 'suppliers' or 'purchase_orders'
+        """
+        self._dirty.add(store)
+        if self._batch_depth == 0:
+            self.flush()
+    
     def add_supplier(self, name: str, contact_person: str, email: str, phone: str,
                     address: str, payment_terms: str = "30 days") -> str:
         """Add a new supplier."""
-        supplier_id = f"SUP{len(self.suppliers) + 1:04d}"
+        supplier_id = f"SUP{self._next_sup:04d}"
+        self._next_sup += 1
         now = datetime.now().isoformat()
         
         supplier = Supplier(
@@ -114,7 +345,7 @@ class SupplierManager:
         )
         
         self.suppliers[supplier_id] = supplier
-        self.save_data()
+        self._mark_dirty('suppliers')
         return supplier_id
     
     def update_supplier(self, supplier_id: str, **kwargs) -> bool:
@@ -128,7 +359,7 @@ class SupplierManager:
                 setattr(supplier, key, value)
         
         supplier.updated_at = datetime.now().isoformat()
-        self.save_data()
+        self._mark_dirty('suppliers')
         return True
     
     def create_purchase_order(self, supplier_id: str, items: List[Dict[str, Any]],
@@ -137,11 +368,12 @@ class SupplierManager:
         if supplier_id not in self.suppliers:
             raise ValueError("Invalid supplier ID")
         
-        po_id = f"PO{len(self.purchase_orders) + 1:06d}"
+        po_id = f"PO{self._next_po:06d}"
+        self._next_po += 1
         now = datetime.now().isoformat()
         
         # Calculate total amount
-        total_amount = sum(item.get('quantity', 0) * item.get('unit_price', 0) for item in items)
+        total_amount = _order_total(items)
         
         po = PurchaseOrder(
             id=po_id,
@@ -154,26 +386,27 @@ class SupplierManager:
             updated_at=now
         )
         
-        self.purchase_orders[po_id] = po
-        self.save_data()
+        self._purchase_orders[po_id] = po
+        self._index_po(po_id, supplier_id)
+        self._mark_dirty('purchase_orders')
         return po_id
     
     def update_po_status(self, po_id: str, status: str, notes: str = "") -> bool:
         """Update purchase order status."""
-        if po_id not in self.purchase_orders:
+        if po_id not in self._purchase_orders:
             return False
         
-        valid_statuses = {'pending', 'confirmed', 'shipped', 'delivered', 'cancelled'}
-        if status not in valid_statuses:
-            raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
+        if status not in _PO_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of: {set(_PO_STATUSES)}")
+        status = _PO_STATUSES[status]
         
-        po = self.purchase_orders[po_id]
+        po = self.get_po(po_id)
         po.status = status
         if notes:
             po.notes = notes
         po.updated_at = datetime.now().isoformat()
         
-        self.save_data()
+        self._mark_dirty('purchase_orders')
         return True
     
     def get_supplier_performance(self, supplier_id: str) -> Dict[str, Any]:
@@ -181,8 +414,21 @@ class SupplierManager:
         if supplier_id not in self.suppliers:
             raise ValueError("Invalid supplier ID")
         
-        # Get all POs for this supplier
-        supplier_pos = [po for po in self.purchase_orders.values() if po.supplier_id == supplier_id]
+        # Only this supplier's orders, via the per-supplier index. Loaded orders
+        # are read from their stored dicts; only delivered ones are built, so
+        # date_micros can keep their parsed dates
+        supplier_pos = []
+        for po_id in self._pos_by_supplier.get(supplier_id, ()):
+            po = self._purchase_orders[po_id]
+            if type(po) is dict:
+                if po.get('status', 'pending') == 'delivered':
+                    po = self.get_po(po_id)
+                else:
+                    supplier_pos.append((po['supplier_id'], po.get('status', 'pending'),
+                                         po.get('total_amount', 0.0), None))
+                    continue
+            supplier_pos.append((po.supplier_id, po.status, po.total_amount, po))
+        supplier_pos = [row for row in supplier_pos if row[0] == supplier_id]
         
         total_orders = len(supplier_pos)
         if total_orders == 0:
@@ -195,26 +441,16 @@ class SupplierManager:
                 'cancelled_orders': 0
             }
         
-        # Calculate metrics
-        total_value = sum(po.total_amount for po in supplier_pos)
-        cancelled = sum(1 for po in supplier_pos if po.status == 'cancelled')
-        
-        # Calculate delivery performance
-        delivered_pos = [po for po in supplier_pos if po.status == 'delivered']
-        on_time = 0
-        total_delay_days = 0
+        total_value = sum(total for _, _, total, _ in supplier_pos)
+        cancelled = sum(1 for _, status, _, _ in supplier_pos if status == 'cancelled')
         
-        for po in delivered_pos:
-            expected = datetime.fromisoformat(po.expected_delivery)
-            actual = datetime.fromisoformat(po.updated_at)
-            delay_days = (actual - expected).days
-            
-            if delay_days <= 0:
-                on_time += 1
-            else:
-                total_delay_days += delay_days
+        # Delivery performance
+        delays = [(po.date_micros('updated_at') - po.date_micros('expected_delivery')) // DAY_MICROS
+                  for _, status, _, po in supplier_pos if status == 'delivered']
+        delivered_count = len(delays)
+        on_time = sum(1 for delay in delays if delay <= 0)
+        total_delay_days = sum(delay for delay in delays if delay > 0)
         
-        delivered_count = len(delivered_pos)
         on_time_rate = (on_time / delivered_count * 100) if delivered_count > 0 else 0
         avg_delay = (total_delay_days / delivered_count) if delivered_count > 0 else 0
         
@@ -229,16 +465,20 @@ class SupplierManager:
     
     def get_pending_orders(self) -> List[PurchaseOrder]:
         """Get all pending purchase orders."""
-        return [po for po in self.purchase_orders.values() if po.status == 'pending']
+        # Read from the orders themselves, so direct status edits are seen
+        return [self.get_po(po_id) for po_id, po in self._purchase_orders.items()
+                if (po.get('status', 'pending') if type(po) is dict else po.status) == 'pending']
     
     def get_supplier_order_history(self, supplier_id: str) -> List[PurchaseOrder]:
         """Get order history for a specific supplier."""
-        return [po for po in self.purchase_orders.values() if po.supplier_id == supplier_id]
+        return [self.get_po(po_id) for po_id in self._pos_by_supplier.get(supplier_id, ())]
     
     def search_suppliers(self, query: str) -> List[Supplier]:
         """Search suppliers by name or contact person."""
         query = query.lower()
-        return [
-            supplier for supplier in self.suppliers.values()
-            if query in supplier.name.lower() or query in supplier.contact_person.lower()
-        ] 
\ No newline at end of file
+        results = []
+        for supplier_id, supplier in self.suppliers.items():
+            key = self._supplier_key(supplier_id, supplier)
+            if query in key[2] or query in key[3]:
+                results.append(supplier)
+        return results 
\ No newline at end of file
@@ -1,9 +1,17 @@
-import uuid
-from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import math
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, fields
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1)
+DAY_MICROS = 86_400_000_000
+
+def to_micros(dt: datetime) -> int:
+    """Naive datetime as epoch microseconds; differences match datetime subtraction exactly."""
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+@dataclass(slots=True)
 class Batch:
     """Represents a batch/lot of products."""
     batch_id: str
@@ -18,6 +26,8 @@ class Batch:
     notes: str = ""
     created_at: str = ""
     updated_at: str = ""
+    # (expiration_date, its epoch microseconds), parsed on first use
+    _expiration: Optional[Tuple[str, int]] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.created_at:
@@ -25,12 +35,32 @@ class Batch:
         if not self.updated_at:
             self.updated_at = self.created_at
 
+    def expiration_micros(self) -> Optional[int]:
+        """Expiration date as epoch microseconds, or None if the batch has none."""
+        if not self.expiration_date:
+            return None
+        cached = self._expiration
+        # Re-parse only if expiration_date was reassigned since the last call
+        if cached is None or cached[0] is not self.expiration_date:
+            cached = self._expiration = (self.expiration_date, to_micros(datetime.fromisoformat(self.expiration_date)))
+        return cached[1]
+
+    def to_dict(self) -> dict:
+        """Convert the batch to a dictionary for serialization."""
+        return {key: getattr(self, key) for key in _BATCH_FIELDS}
+
+_BATCH_FIELDS = tuple(f.name for f in fields(Batch) if f.init)
+
 class Product:
     """
     Represents a product in the inventory system.
     All fields are optional and default to empty or zero values for flexibility.
     Includes batch/lot tracking capabilities.
     """
+    __slots__ = ('product_id', 'name', 'category', 'quantity', 'price', 'description',
+                 'requires_batch_tracking', 'min_quantity', 'reorder_point',
+                 'preferred_supplier_id', 'batches', 'created_at', 'updated_at')
+
     def __init__(self, product_id: str = None, name: str = "", category: str = "", 
                  quantity: int = 0, price: float = 0.0, description: str = "",
                  requires_batch_tracking: bool = False, min_quantity: int = 0,
@@ -65,7 +95,7 @@ class Product:
     def generate_id() -> str:
         """Generate a random, uniform, barcode-like product ID."""
         # Example: PRD-XXXXXXXX (8 uppercase hex digits)
-        return f"PRD-{uuid.uuid4().hex[:8].upper()}"
+        return f"PRD-{secrets.token_hex(4).upper()}"
 
     def add_batch(self, quantity: int, manufacturing_date: str,
                  expiration_date: Optional[str] = None, lot_number: str = "",
@@ -80,7 +110,7 @@ class Product:
         if not self.requires_batch_tracking:
             raise ValueError("This product does not require batch tracking")
 
-        batch_id = f"BAT-{uuid.uuid4().hex[:8].upper()}"
+        batch_id = f"BAT-{secrets.token_hex(4).upper()}"
         batch = Batch(
             batch_id=batch_id,
             product_id=self.product_id,
@@ -119,9 +149,8 @@ class Product:
             return False
 
         batch.quantity = new_quantity
-        batch.updated_at = datetime.now().isoformat()
         self._update_total_quantity()
-        self.updated_at = datetime.now().isoformat()
+        batch.updated_at = self.updated_at = datetime.now().isoformat()
         return True
 
     def remove_batch(self, batch_id: str) -> bool:
@@ -138,28 +167,20 @@ class Product:
         if not self.requires_batch_tracking:
             return []
 
-        threshold_date = datetime.now()
-        expiring = []
-
-        for batch in self.batches.values():
-            if batch.expiration_date:
-                expiry = datetime.fromisoformat(batch.expiration_date)
-                days_until_expiry = (expiry - threshold_date).days
-                if 0 <= days_until_expiry <= days_threshold:
-                    expiring.append(batch)
-
-        return expiring
+        # 0 <= whole days until expiry <= threshold, as a window of micros
+        now = to_micros(datetime.now())
+        end = now + (math.floor(days_threshold) + 1) * DAY_MICROS
+        return [batch for batch in self.batches.values()
+                if (expiry := batch.expiration_micros()) is not None and now <= expiry < end]
 
     def get_expired_batches(self) -> List[Batch]:
         """Get batches that have already expired."""
         if not self.requires_batch_tracking:
             return []
 
-        current_date = datetime.now()
-        return [
-            batch for batch in self.batches.values()
-            if batch.expiration_date and datetime.fromisoformat(batch.expiration_date) < current_date
-        ]
+        now = to_micros(datetime.now())
+        return [batch for batch in self.batches.values()
+                if (expiry := batch.expiration_micros()) is not None and expiry < now]
 
     def _update_total_quantity(self) -> None:
         """Update the total quantity based on batch quantities."""
@@ -179,7 +200,7 @@ class Product:
             "min_quantity": self.min_quantity,
             "reorder_point": self.reorder_point,
             "preferred_supplier_id": self.preferred_supplier_id,
-            "batches": {bid: vars(batch) for bid, batch in self.batches.items()},
+            "batches": {bid: batch.to_dict() for bid, batch in self.batches.items()},
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
@@ -187,26 +208,33 @@ class Product:
     @staticmethod
     def from_dict(data: dict):
         """Create a Product instance from a dictionary, allowing missing fields."""
-        product = Product(
-            product_id=data.get("product_id"),
-            name=data.get("name", ""),
-            category=data.get("category", ""),
-            quantity=int(data.get("quantity", 0)),
-            price=float(data.get("price", 0.0)),
-            description=data.get("description", ""),
-            requires_batch_tracking=data.get("requires_batch_tracking", False),
-            min_quantity=int(data.get("min_quantity", 0)),
-            reorder_point=int(data.get("reorder_point", 0)),
-            preferred_supplier_id=data.get("preferred_supplier_id", "")
-        )
-        
+        # Fill the slots directly: Product() would stamp datetime.now() and
+        # generate an id even when the record already carries both
+        product = Product.__new__(Product)
+        product.product_id = data.get("product_id") or Product.generate_id()
+        product.name = data.get("name", "")
+        product.category = data.get("category", "")
+        product.quantity = int(data.get("quantity", 0))
+        product.price = float(data.get("price", 0.0))
+        product.description = data.get("description", "")
+        product.requires_batch_tracking = data.get("requires_batch_tracking", False)
+        product.min_quantity = int(data.get("min_quantity", 0))
+        product.reorder_point = int(data.get("reorder_point", 0))
+        product.preferred_supplier_id = data.get("preferred_supplier_id", "")
+
         # Restore batches if present
+        product.batches = {}
         batches_data = data.get("batches", {})
         for batch_data in batches_data.values():
             product.batches[batch_data["batch_id"]] = Batch(**batch_data)
-        
-        # Restore timestamps
-        product.created_at = data.get("created_at", product.created_at)
-        product.updated_at = data.get("updated_at", product.updated_at)
-        
+
+        # Restore timestamps, defaulting both to the load time
+        if "created_at" in data and "updated_at" in data:
+            product.created_at = data["created_at"]
+            product.updated_at = data["updated_at"]
+        else:
+            now = datetime.now().isoformat()
+            product.created_at = data.get("created_at", now)
+            product.updated_at = data.get("updated_at", now)
+
         return product 
\ No newline at end of file
@@ -1,33 +1,115 @@
 """
 File utility functions for Inventory Management System.
 """
-import json
+import atexit
 import csv
+import functools
+import gzip
+import operator
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox
+from src.utils.io_utils import atomic_write, dumps_json, load_json_file, loads_json
+
+# tkinter is imported where a dialog is opened, keeping it out of headless startup
+if TYPE_CHECKING:
+    import tkinter as tk
+
+# Failed-check flags returned by FileUtils.validate_product_fast, in the
+# order validate_product_data lists the matching messages
+MISSING_NAME = 1
+MISSING_CATEGORY = 2
+MISSING_PRICE = 4
+MISSING_QUANTITY = 8
+BAD_PRICE = 16
+BAD_QUANTITY = 32
+BAD_MIN_STOCK = 64
+
+# Product checks: (field, flag) for fields that must be present and
+# non-empty, and (field, type to cast to, flag, skip empty values) type checks
+_REQUIRED_PRODUCT_FIELDS = (
+    ('name', MISSING_NAME),
+    ('category', MISSING_CATEGORY),
+    ('price', MISSING_PRICE),
+    ('quantity', MISSING_QUANTITY),
+)
+_TYPED_PRODUCT_FIELDS = (
+    ('price', float, BAD_PRICE, False),
+    ('quantity', int, BAD_QUANTITY, False),
+    ('min_stock', int, BAD_MIN_STOCK, True),
+)
+_PRODUCT_ERROR_MESSAGES = tuple(
+    (flag, f"Missing required field: {field}") for field, flag in _REQUIRED_PRODUCT_FIELDS
+) + (
+    (BAD_PRICE, "Price must be a valid number"),
+    (BAD_QUANTITY, "Quantity must be a valid integer"),
+    (BAD_MIN_STOCK, "Minimum stock must be a valid integer"),
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _default_extension(pattern: str) -> str:
+    """
+    Tk defaultextension for a filetypes pattern.
+    
+    Args:
+        pattern: Pattern such as '*.json' or '*.yaml;*.yml' (the first one is used)
+        
+    Returns:
+        str: Extension with its leading dot ('.json'), or '' for wildcards like '*.*'
+    """
+    patterns = pattern.replace(';', ' ').split()
+    ext = patterns[0].lstrip('*').lstrip('.') if patterns else ''
+    return f".{ext}" if ext and '*' not in ext else ''
+
+
+def _dialog_parent() -> 'tk.Tk':
+    """
+    Root window to own file dialogs.
+    
+    Uses the application's root if one is running; otherwise creates a hidden
+    root once and keeps it for later dialogs, since starting Tk is slow.
+    """
+    import tkinter as tk
+    root = tk._default_root
+    if root is None:
+        root = tk.Tk()
+        root.withdraw()  # Hide the main window
+        atexit.register(_destroy_quietly, root)
+    return root
+
+
+def _destroy_quietly(root: 'tk.Tk') -> None:
+    """Destroy a root window at exit, ignoring one that is already gone."""
+    import tkinter as tk
+    try:
+        root.destroy()
+    except tk.TclError:
+        pass
 
 
 class FileUtils:
     """Utility class for file operations and data management."""
     
     @staticmethod
-    def save_to_json(data: Dict[str, Any], filename: str) -> bool:
+    def save_to_json(data: Dict[str, Any], filename: str, compact: bool = True) -> bool:
         """
         Save data to JSON file with error handling.
         
         Args:
             data: Data to save
             filename: Target filename
+            compact: Write without whitespace; pass False for a 2-space
+                indented file meant to be read by people
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            payload = dumps_json(data, indent=not compact)
+            # One write of the finished payload; larger-than-buffer writes bypass the copy
+            with atomic_write(filename, 'wb') as f:
+                f.write(payload)
             return True
         except Exception as e:
             print(f"Error saving to JSON: {e}")
@@ -39,16 +121,22 @@ class FileUtils:
         Load data from JSON file with error handling.
         
         Args:
-            filename: Source filename
+            filename: Source filename; names ending in .gz (such as
+                backup_data output) are decompressed first
             
         Returns:
             Dict or None: Loaded data or None if error
         """
         try:
-            if not os.path.exists(filename):
-                return {}
-            with open(filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            if filename.endswith('.gz'):
+                with gzip.open(filename, 'rb') as f:
+                    raw = f.read()
+                return loads_json(raw)
+            with open(filename, 'rb') as f:
+                return load_json_file(f)
+        except FileNotFoundError:
+            # Opened without a separate exists() probe; a missing file loads as empty
+            return {}
         except Exception as e:
             print(f"Error loading from JSON: {e}")
             return None
@@ -67,10 +155,23 @@ class FileUtils:
             bool: True if successful, False otherwise
         """
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(data)
+            # Same rule as csv.DictWriter: keys outside fieldnames are an error
+            extra = set().union(*data).difference(fieldnames)
+            if extra:
+                raise ValueError(f"dict contains fields not in fieldnames: {', '.join(map(repr, extra))}")
+            # Rows normally carry every field, so project them with a C-level itemgetter
+            rows = None
+            if len(fieldnames) > 1:
+                try:
+                    rows = list(map(operator.itemgetter(*fieldnames), data))
+                except KeyError:
+                    pass  # some rows omit fields; those are written as ''
+            if rows is None:
+                rows = [[row.get(key, '') for key in fieldnames] for row in data]
+            with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                writer.writerows(rows)
             return True
         except Exception as e:
             print(f"Error exporting to CSV: {e}")
@@ -88,14 +189,14 @@ class FileUtils:
         Returns:
             str or None: Selected filename or None if cancelled
         """
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
+        # Imported here so headless use of FileUtils never loads Tk
+        from tkinter import filedialog
         filename = filedialog.asksaveasfilename(
+            parent=_dialog_parent(),
             title=title,
             filetypes=filetypes,
-            defaultextension=filetypes[0][1] if filetypes else ""
+            defaultextension=_default_extension(filetypes[0][1]) if filetypes else ""
         )
-        root.destroy()
         return filename if filename else None
     
     @staticmethod
@@ -110,19 +211,18 @@ class FileUtils:
         Returns:
             str or None: Selected filename or None if cancelled
         """
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
+        from tkinter import filedialog
         filename = filedialog.askopenfilename(
+            parent=_dialog_parent(),
             title=title,
             filetypes=filetypes
         )
-        root.destroy()
         return filename if filename else None
     
     @staticmethod
     def backup_data(data: Dict[str, Any], backup_dir: str = "backups") -> bool:
         """
-        Create a backup of data with timestamp.
+        Create a gzip-compressed, timestamped JSON backup of data.
         
         Args:
             data: Data to backup
@@ -136,49 +236,62 @@ class FileUtils:
                 os.makedirs(backup_dir)
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = os.path.join(backup_dir, f"backup_{timestamp}.json")
+            backup_filename = os.path.join(backup_dir, f"backup_{timestamp}.json.gz")
             
-            return FileUtils.save_to_json(data, backup_filename)
+            payload = dumps_json(data)
+            # Level 1 is close to copy speed and still shrinks JSON several-fold
+            with atomic_write(backup_filename, 'wb') as raw, \
+                    gzip.GzipFile(filename=os.path.basename(backup_filename)[:-3], mode='wb',
+                                  compresslevel=1, fileobj=raw) as f:
+                f.write(payload)
+            return True
         except Exception as e:
             print(f"Error creating backup: {e}")
             return False
     
     @staticmethod
-    def validate_product_data(product: Dict[str, Any]) -> List[str]:
+    def validate_product_fast(product: Dict[str, Any]) -> int:
         """
-        Validate product data and return list of errors.
+        Validate product data without building error messages.
         
         Args:
             product: Product data to validate
             
         Returns:
-            List[str]: List of validation errors
+            int: OR of the failed-check flags (MISSING_NAME, BAD_PRICE, ...);
+                0 if the product is valid
         """
-        errors = []
-        
-        # Required fields
-        required_fields = ['name', 'category', 'price', 'quantity']
-        for field in required_fields:
-            if field not in product or not product[field]:
-                errors.append(f"Missing required field: {field}")
+        flags = 0
+        for field, flag in _REQUIRED_PRODUCT_FIELDS:
+            if not product.get(field):
+                flags |= flag
         
-        # Data type validation
-        if 'price' in product:
+        # Data type validation; values already of the target type need no cast
+        for field, cast, flag, skip_empty in _TYPED_PRODUCT_FIELDS:
+            if field not in product:
+                continue
+            value = product[field]
+            if type(value) is cast or (skip_empty and not value):
+                continue
             try:
-                float(product['price'])
+                cast(value)
             except (ValueError, TypeError):
-                errors.append("Price must be a valid number")
+                flags |= flag
         
-        if 'quantity' in product:
-            try:
-                int(product['quantity'])
-            except (ValueError, TypeError):
-                errors.append("Quantity must be a valid integer")
-        
-        if 'min_stock' in product and product['min_stock']:
-            try:
-                int(product['min_stock'])
-            except (ValueError, TypeError):
-                errors.append("Minimum stock must be a valid integer")
+        return flags
+    
+    @staticmethod
+    def validate_product_data(product: Dict[str, Any]) -> List[str]:
+        """
+        Validate product data and return list of errors.
         
-        return errors 
\ No newline at end of file
+        Args:
+            product: Product data to validate
+            
+        Returns:
+            List[str]: List of validation errors
+        """
+        flags = FileUtils.validate_product_fast(product)
+        if not flags:
+            return []
+        return [message for flag, message in _PRODUCT_ERROR_MESSAGES if flags & flag]
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Low-level I/O helpers for Inventory Management System.
+"""
+import json
+import mmap
+import os
+import shutil
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Iterator, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder/decoder
+    orjson = None
+
+
+@contextmanager
+def atomic_write(filepath: Union[str, os.PathLike], mode: str = 'w', **kwargs) -> Iterator[IO]:
+    """
+    Write to a temporary sibling file and move it over the target on success.
+
+    os.replace is atomic, so readers (and a crash mid-write) only ever see
+    the old file or the complete new one. If the block raises, the
+    temporary file is removed and the target is left untouched.
+
+    Args:
+        filepath: Target filename
+        mode: File mode ('w' or 'wb')
+        **kwargs: Extra arguments passed to open()
+
+    Yields:
+        IO: The open temporary file
+    """
+    tmp_path = f"{os.fspath(filepath)}.tmp"
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def copy_file(source: Union[str, os.PathLike], destination: Union[str, os.PathLike]) -> None:
+    """
+    Copy a file and its metadata, in-kernel where the platform allows.
+
+    Args:
+        source: File to copy
+        destination: Target filename
+
+    Raises:
+        FileNotFoundError: If the source does not exist
+    """
+    try:
+        # In-kernel copy; reflinks on CoW filesystems (btrfs, XFS)
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except FileNotFoundError:
+        raise
+    except (AttributeError, OSError):
+        # copy_file_range is Linux-only; copyfile uses sendfile where it can
+        shutil.copyfile(source, destination)
+    shutil.copystat(source, destination)
+
+
+def dumps_json(data: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes, with orjson when it is installed.
+
+    Non-str keys are stringified like json.dumps does, and orjson also
+    encodes dataclass instances and NumPy values natively.
+
+    Args:
+        data: Data to serialize
+        indent: Indent by 2 spaces instead of writing compact JSON
+        default: Converts objects neither encoder supports natively
+
+    Returns:
+        bytes: The encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=default).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=default).encode('utf-8')
+
+
+def loads_json(raw: bytes) -> Any:
+    """Parse JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def load_json_file(f: IO[bytes]) -> Any:
+    """Parse an open binary JSON file, handing orjson a zero-copy mmap view when possible."""
+    if orjson is not None:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # empty file, or mmap unsupported here
+            pass
+        else:
+            # Parse straight from the page cache, without a read() copy
+            with mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    return loads_json(f.read())
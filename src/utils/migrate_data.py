@@ -9,12 +9,14 @@ converts them to the new unified JSON format.
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the current directory to Python path to import inventory_manager
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.managers.inventory_manager import InventoryManager
+from src.utils.io_utils import copy_file
 
 def migrate_data():
     """Migrate data from old format files to the unified system."""
@@ -26,48 +28,55 @@ def migrate_data():
     pos_file = "../PointOfSales/products.txt"
     general_file = "inventory.txt"
     
-    print("🔄 Starting data migration...")
-    print(f"📁 POS Products file: {pos_file}")
-    print(f"📁 General Inventory file: {general_file}")
+    # Collect the report and write it in one go instead of a write per line
+    out = ["🔄 Starting data migration...",
+           f"📁 POS Products file: {pos_file}",
+           f"📁 General Inventory file: {general_file}"]
     
     # Check if files exist
     if not os.path.exists(pos_file):
-        print(f"⚠️  POS products file not found: {pos_file}")
+        out.append(f"⚠️  POS products file not found: {pos_file}")
     else:
-        print(f"✅ Found POS products file: {pos_file}")
+        out.append(f"✅ Found POS products file: {pos_file}")
     
     if not os.path.exists(general_file):
-        print(f"⚠️  General inventory file not found: {general_file}")
+        out.append(f"⚠️  General inventory file not found: {general_file}")
     else:
-        print(f"✅ Found general inventory file: {general_file}")
+        out.append(f"✅ Found general inventory file: {general_file}")
+    
+    # Show progress before the migration, which reports its own errors
+    sys.stdout.write('\n'.join(out) + '\n')
+    sys.stdout.flush()
     
     # Perform migration
     success = inventory_manager.migrate_from_old_format(pos_file, general_file)
     
     if success:
-        print("✅ Data migration completed successfully!")
+        out = ["✅ Data migration completed successfully!"]
         
         # Get statistics
         stats = inventory_manager.get_inventory_stats()
-        print("\n📊 Migration Statistics:")
-        print(f"   POS Products: {stats['total_pos_products']}")
-        print(f"   General Items: {stats['total_general_items']}")
-        print(f"   Total POS Value: ${stats['total_pos_value']:.2f}")
-        print(f"   Total POS Stock: {stats['total_pos_stock']}")
-        print(f"   Total General Quantity: {stats['total_general_quantity']}")
+        out.append("\n📊 Migration Statistics:")
+        out.append(f"   POS Products: {stats['total_pos_products']}")
+        out.append(f"   General Items: {stats['total_general_items']}")
+        out.append(f"   Total POS Value: ${stats['total_pos_value']:.2f}")
+        out.append(f"   Total POS Stock: {stats['total_pos_stock']}")
+        out.append(f"   Total General Quantity: {stats['total_general_quantity']}")
         
         # Show some sample data
-        print("\n📋 Sample POS Products:")
+        out.append("\n📋 Sample POS Products:")
         pos_products = inventory_manager.get_all_pos_products()
-        for i, product in enumerate(pos_products[:5]):  # Show first 5
-            print(f"   {i+1}. {product.name} - ${product.price:.2f} (Stock: {product.stock})")
+        out.extend(f"   {i}. {product.name} - ${product.price:.2f} (Stock: {product.stock})"
+                   for i, product in enumerate(pos_products[:5], 1))  # Show first 5
         
-        print("\n📋 Sample General Items:")
+        out.append("\n📋 Sample General Items:")
         general_items = inventory_manager.get_all_general_items()
-        for i, item in enumerate(general_items[:5]):  # Show first 5
-            print(f"   {i+1}. {item.name} - {item.quantity} {item.unit} ({item.category})")
+        out.extend(f"   {i}. {item.name} - {item.quantity} {item.unit} ({item.category})"
+                   for i, item in enumerate(general_items[:5], 1))  # Show first 5
         
-        print(f"\n💾 Unified data saved to: {inventory_manager.data_file}")
+        out.append(f"\n💾 Unified data saved to: {inventory_manager.data_file}")
+        sys.stdout.write('\n'.join(out) + '\n')
+        sys.stdout.flush()
         
     else:
         print("❌ Data migration failed!")
@@ -87,14 +96,21 @@ def create_backup():
     
     print("💾 Creating backups...")
     
-    for source, backup_name in files_to_backup:
-        if os.path.exists(source):
-            import shutil
+    # The copies are I/O-bound, so run them side by side and report in order
+    with ThreadPoolExecutor(max_workers=min(8, len(files_to_backup))) as executor:
+        copies = []
+        for source, backup_name in files_to_backup:
             backup_path = os.path.join(backup_dir, backup_name)
-            shutil.copy2(source, backup_path)
-            print(f"   ✅ Backed up {source} to {backup_path}")
-        else:
-            print(f"   ⚠️  Source file not found: {source}")
+            copies.append((source, backup_path, executor.submit(copy_file, source, backup_path)))
+        
+        for source, backup_path, copy in copies:
+            # The copy opens the source anyway, so let it report a missing file
+            try:
+                copy.result()
+            except FileNotFoundError:
+                print(f"   ⚠️  Source file not found: {source}")
+            else:
+                print(f"   ✅ Backed up {source} to {backup_path}")
     
     print(f"📁 Backups saved in: {backup_dir}/")
 